@@ -0,0 +1,148 @@
+"""Solve many puzzles concurrently from a JSON lines job file."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from hanoi.blocks import write_binary
+from hanoi.cache import SolutionCache
+from hanoi.formats import FORMATS, MAX_BINARY_DISKS, write_moves
+from hanoi.solver import SOLVERS, check_pegs, get_solver
+
+
+@dataclass(frozen=True)
+class Job:
+    """A single puzzle to solve and where to write its moves."""
+
+    n: int
+    start: int = 1
+    target: int = 3
+    format: str = 'text'
+    output: str | None = None
+    variant: str = 'classic'
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Job:
+        unknown = set(data) - {'n', 'start', 'target', 'format', 'output', 'variant'}
+        if unknown:
+            raise ValueError(f'unknown job fields: {", ".join(sorted(unknown))}')
+        if 'n' not in data:
+            raise ValueError('job is missing "n"')
+
+        job = cls(**data)
+        # JSON true and 1.0 compare equal to 1, only real integers are accepted
+        if type(job.n) is not int or job.n < 1:
+            raise ValueError(f'"n" must be a positive integer, got {job.n!r}')
+        for name in ('start', 'target'):
+            if type(getattr(job, name)) is not int:
+                raise ValueError(f'"{name}" must be an integer peg, got {getattr(job, name)!r}')
+        check_pegs(job.start, job.target)
+        if job.output is not None and not isinstance(job.output, str):
+            raise ValueError(f'"output" must be a file name or null, got {job.output!r}')
+        if job.format not in FORMATS:
+            raise ValueError(f'unknown format {job.format!r}, expected one of {FORMATS}')
+        if job.format == 'binary' and job.n > MAX_BINARY_DISKS:
+            raise ValueError(f'the binary format holds at most {MAX_BINARY_DISKS} disks, got {job.n}')
+        if job.variant not in SOLVERS:
+            raise ValueError(f'unknown variant {job.variant!r}, expected one of {", ".join(SOLVERS)}')
+        return job
+
+
+@dataclass(frozen=True)
+class JobResult:
+    job: Job
+    moves: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Moves per second."""
+        return self.moves / self.seconds if self.seconds > 0 else float('inf')
+
+
+def load_jobs(path: str | os.PathLike) -> list[Job]:
+    """Read jobs from a JSON lines file, one job object per line. Blank lines are skipped."""
+    jobs = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                jobs.append(Job.from_dict(json.loads(line)))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f'{path}:{line_no}: {e}') from e
+    return jobs
+
+
+def run_job(job: Job, cache: SolutionCache | None = None) -> JobResult:
+    """Solve one job and write its moves. Runs inside a worker process.
+
+    With a ``cache``, solutions worth caching are read from it, and generated
+    into it first when missing.
+    """
+    if cache is not None and cache.cacheable(job.variant, job.n, job.start, job.target):
+        return _run_cached_job(job, cache)
+    solver = get_solver(job.variant)
+    start = time.perf_counter()
+    moves = solver.moves(job.n, job.start, job.target)
+    if job.output is None:
+        count = sum(1 for _ in moves)
+    else:
+        Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(job.output, 'wb') as out:
+            if job.variant == 'classic' and job.format == 'binary':
+                # Copied from precomputed blocks, without going through the moves one by one
+                count = write_binary(out, job.n, job.start, job.target)
+            else:
+                count = write_moves(
+                    out,
+                    moves,
+                    job.format,
+                    n=job.n,
+                    start=job.start,
+                    target=job.target,
+                    total_moves=solver.count(job.n, job.start, job.target),
+                    variant=job.variant,
+                )
+    return JobResult(job=job, moves=count, seconds=time.perf_counter() - start)
+
+
+def _run_cached_job(job: Job, cache: SolutionCache) -> JobResult:
+    start = time.perf_counter()
+    with cache.open(job.variant, job.n, job.start, job.target) as solution:
+        count = len(solution)
+        if job.output is not None:
+            Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+            with open(job.output, 'wb') as out:
+                if job.format == 'binary':
+                    # The cached file is exactly what the job would write. Copied from the
+                    # mapping, the file itself may already have been evicted by another process.
+                    out.write(solution.mmap)
+                else:
+                    write_moves(
+                        out,
+                        solution.moves(),
+                        job.format,
+                        n=job.n,
+                        start=job.start,
+                        target=job.target,
+                        total_moves=count,
+                    )
+    return JobResult(job=job, moves=count, seconds=time.perf_counter() - start)
+
+
+def run_batch(jobs: list[Job], workers: int | None = None, cache: SolutionCache | None = None) -> list[JobResult]:
+    """Run ``jobs`` across a process pool and return their results in job order.
+
+    ``workers`` defaults to the number of CPUs. The workers share ``cache``.
+    """
+    if not jobs:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(run_job, cache=cache), jobs))
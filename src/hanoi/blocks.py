@@ -0,0 +1,138 @@
+"""Bulk generation of the classic solution in the binary format from relabeled template blocks."""
+
+from __future__ import annotations
+
+import struct
+import time
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO
+
+from hanoi.formats import CHUNK_MOVES, HEADER, MOVE_SIZE, pack_header, pack_move, unpack_header
+from hanoi.solver import Move, check_pegs, get_solver, hanoi
+
+if TYPE_CHECKING:
+    from hanoi.cache import SolutionCache
+
+# Disks in a template block. Blocks of up to 15 disks keep every peg in the low
+# nibble and the high byte of each packed move zero, see _relabel_table.
+BLOCK_DISKS = 15
+
+
+@lru_cache(maxsize=None)
+def _base_block(k: int) -> bytes:
+    """The packed solution for ``k`` disks from peg 1 to peg 3."""
+    return struct.pack(f'<{(1 << k) - 1}H', *(pack_move(*move) for move in hanoi(k, 1, 3)))
+
+
+def _relabel_table(pegs: dict[int, int]) -> bytes:
+    # A packed byte is disk << 4 | from << 2 | to; map both peg fields and keep the disk
+    table = bytearray(256)
+    for byte in range(256):
+        from_, to = byte >> 2 & 0b11, byte & 0b11
+        table[byte] = byte & 0xF0 | pegs.get(from_, from_) << 2 | pegs.get(to, to)
+    return bytes(table)
+
+
+@lru_cache(maxsize=None)
+def block(k: int, start: int, target: int) -> bytes:
+    """The packed solution for ``k`` disks from ``start`` to ``target``, built once per peg permutation.
+
+    Every block is the 1 -> 3 block with its pegs renamed, which ``bytes.translate``
+    does in a single pass over the bytes.
+    """
+    if not 1 <= k <= BLOCK_DISKS:
+        raise ValueError(f'blocks hold 1 to {BLOCK_DISKS} disks, got {k}')
+    return _base_block(k).translate(_relabel_table({1: start, 2: 6 - start - target, 3: target}))
+
+
+def chunks(disks: int, start: int = 1, target: int = 3, k: int = BLOCK_DISKS) -> Iterator[bytes]:
+    """The packed classic solution as a few large chunks of bytes.
+
+    Between two moves of the disks larger than ``k``, the ``k`` smallest disks
+    always make a full transfer, and like every disk they go round the pegs in a
+    fixed cycle. So the solution is one of three blocks, a move of a large disk,
+    the next block in the cycle, and so on; the large disk moves are themselves
+    the solution for ``disks - k`` disks.
+    """
+    check_pegs(start, target)
+    if disks <= k:
+        if disks > 0:
+            yield block(disks, start, target)
+        return
+
+    spare = 6 - start - target
+    cycle = (start, target, spare) if (disks - k) % 2 == 0 else (start, spare, target)
+    blocks = [block(k, cycle[j], cycle[(j + 1) % 3]) for j in range(3)]
+    yield blocks[0]
+    for j, (disk, from_, to) in enumerate(hanoi(disks - k, start, target), 1):
+        yield struct.pack('<H', pack_move(disk + k, from_, to))
+        yield blocks[j % 3]
+
+
+def write_binary(out: BinaryIO, disks: int, start: int = 1, target: int = 3) -> int:
+    """Write the classic solution in the binary format. Returns the number of moves written.
+
+    Produces the same bytes as ``write_moves(out, hanoi(disks, start, target), 'binary', ...)``.
+    """
+    out.write(pack_header(disks, start, target))
+    out.writelines(chunks(disks, start, target))
+    return (1 << disks) - 1 if disks > 0 else 0
+
+
+def verify(stream: BinaryIO, cache: SolutionCache | None = None) -> int | None:
+    """Compare a binary move file with the solution its header describes.
+
+    Returns None when they match, otherwise the number of the first move that
+    differs, is missing or is one too many. Whole chunks are compared at once,
+    taken from ``cache`` when the solution is worth caching, and for the
+    classic variant from the template blocks otherwise.
+    """
+    disks, start, target, variant = unpack_header(stream.read(HEADER.size))
+
+    if cache is not None and cache.cacheable(variant, disks, start, target):
+        with cache.open(variant, disks, start, target) as solution:
+            return _compare(stream, solution.chunks())
+    if variant == 'classic':
+        return _compare(stream, chunks(disks, start, target))
+    return _compare(stream, _packed(get_solver(variant).moves(disks, start, target)))
+
+
+def _packed(moves: Iterator[Move]) -> Iterator[bytes]:
+    while True:
+        chunk = list(islice(moves, CHUNK_MOVES))
+        if not chunk:
+            return
+        yield struct.pack(f'<{len(chunk)}H', *(pack_move(*move) for move in chunk))
+
+
+def _compare(stream: BinaryIO, expected: Iterator[bytes]) -> int | None:
+    offset = 0
+    for chunk in expected:
+        data = stream.read(len(chunk))
+        if data != chunk:
+            mismatch = next((i for i, (a, b) in enumerate(zip(data, chunk)) if a != b), len(data))
+            return (offset + mismatch) // MOVE_SIZE + 1
+        offset += len(chunk)
+    if stream.read(1):
+        return offset // MOVE_SIZE + 1
+    return None
+
+
+if __name__ == '__main__':
+    import io
+
+    from hanoi.formats import write_moves
+
+    disks = 22
+
+    for name, write in (
+        ('per move', lambda out: write_moves(out, hanoi(disks), 'binary', n=disks)),
+        ('blocks', lambda out: write_binary(out, disks)),
+    ):
+        out = io.BytesIO()
+        start = time.perf_counter()
+        moves = write(out)
+        seconds = time.perf_counter() - start
+        print(f'{name:>10}: {disks} disks, {moves:,} moves in {seconds:6.3f} seconds ({moves / seconds:,.0f} moves/s)')
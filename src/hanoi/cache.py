@@ -0,0 +1,212 @@
+"""Persistent on-disk cache of solutions in the packed binary format, read back with mmap."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+from hanoi.blocks import write_binary
+from hanoi.formats import HEADER, MAX_BINARY_DISKS, MOVE_SIZE, VERSION, unpack_header, unpack_move, write_moves
+from hanoi.solver import Move, get_solver, hanoi_from
+
+CACHE_ENV = 'HANOI_CACHE_DIR'
+DEFAULT_CACHE_MB = 1024
+
+# Shorter solutions are quicker to generate than to read back, they are never cached
+CACHE_MIN_MOVES = 1 << 16
+
+# Bytes handed out per chunk when a cached file is compared or copied
+CHUNK_BYTES = 1 << 20
+
+
+def cache_key(variant: str, n: int, start: int, target: int) -> str:
+    """Name of the file holding a solution: a digest of everything that determines its bytes."""
+    description = f'hanoi-binary-v{VERSION}:{variant}:{n}:{start}:{target}'
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def default_cache_dir() -> str | None:
+    """The cache directory from the environment, or None when caching is off."""
+    return os.environ.get(CACHE_ENV) or None
+
+
+def solution_cache(directory: str | os.PathLike | None, size_mb: int = DEFAULT_CACHE_MB) -> SolutionCache | None:
+    """The cache in ``directory`` holding up to ``size_mb`` megabytes, or None without a directory."""
+    if directory is None:
+        return None
+    return SolutionCache(directory, size_mb << 20)
+
+
+class CachedSolution:
+    """A solution file mapped into memory. Moves are read straight from the mapping."""
+
+    def __init__(self, path: str | os.PathLike):
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = os.fspath(path)
+        try:
+            if len(self.mmap) < HEADER.size or (len(self.mmap) - HEADER.size) % MOVE_SIZE:
+                raise ValueError('not a binary move file')
+            self.n, self.start, self.target, self.variant = unpack_header(self.mmap[: HEADER.size])
+        except ValueError as e:
+            self.close()
+            raise ValueError(f'{self.path}: {e}') from None
+
+    def __len__(self) -> int:
+        return (len(self.mmap) - HEADER.size) // MOVE_SIZE
+
+    def move(self, index: int) -> Move:
+        """Move ``index``, 0-based, without reading the ones before it."""
+        (packed,) = struct.unpack_from('<H', self.mmap, HEADER.size + index * MOVE_SIZE)
+        return unpack_move(packed)
+
+    def moves(self, first: int = 0) -> Iterator[Move]:
+        """The moves from index ``first`` on."""
+        for offset in range(HEADER.size + first * MOVE_SIZE, len(self.mmap), CHUNK_BYTES):
+            chunk = self.mmap[offset : offset + CHUNK_BYTES]
+            for (packed,) in struct.iter_unpack('<H', chunk):
+                yield unpack_move(packed)
+
+    def chunks(self) -> Iterator[bytes]:
+        """The packed moves, without the header, in large chunks."""
+        for offset in range(HEADER.size, len(self.mmap), CHUNK_BYTES):
+            yield self.mmap[offset : offset + CHUNK_BYTES]
+
+    def close(self) -> None:
+        self.mmap.close()
+
+    def __enter__(self) -> CachedSolution:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SolutionCache:
+    """Solutions keyed by variant, disks and pegs in a directory that several processes may share.
+
+    Files are written to a temporary name and renamed into place, so readers
+    never see a partial file. Reading a file marks it as used, and after every
+    write the least recently used files are removed until the directory is
+    under ``max_bytes``. Files written or read since the cache was created are
+    never removed by it, so the workers of a batch sharing one cache do not
+    remove each other's solutions while they are in use.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_CACHE_MB << 20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Less a second for file systems with coarse timestamps
+        self.started = time.time() - 1
+
+    def path(self, variant: str, n: int, start: int = 1, target: int = 3) -> Path:
+        return self.directory / f'{cache_key(variant, n, start, target)}.hnb'
+
+    def cacheable(self, variant: str, n: int, start: int = 1, target: int = 3) -> bool:
+        """Worth caching: long enough to matter, small enough to fit."""
+        count = get_solver(variant).count(n, start, target)
+        return n <= MAX_BINARY_DISKS and count >= CACHE_MIN_MOVES and HEADER.size + count * MOVE_SIZE <= self.max_bytes
+
+    def get(self, variant: str, n: int, start: int = 1, target: int = 3) -> CachedSolution | None:
+        """The cached solution, or None when it is not cached (or the file is damaged)."""
+        path = self.path(variant, n, start, target)
+        try:
+            solution = CachedSolution(path)
+        except (OSError, ValueError):
+            return None
+        expected = (n, start, target, variant, get_solver(variant).count(n, start, target))
+        if (solution.n, solution.start, solution.target, solution.variant, len(solution)) != expected:
+            solution.close()
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return solution
+
+    def put(self, variant: str, n: int, start: int = 1, target: int = 3) -> Path:
+        """Generate a solution into the cache, replacing any previous copy."""
+        self._generate(variant, n, start, target).close()
+        return self.path(variant, n, start, target)
+
+    def open(self, variant: str, n: int, start: int = 1, target: int = 3) -> CachedSolution:
+        """The cached solution, generating and caching it first when needed."""
+        solution = self.get(variant, n, start, target)
+        if solution is None:
+            solution = self._generate(variant, n, start, target)
+        return solution
+
+    def _generate(self, variant: str, n: int, start: int, target: int) -> CachedSolution:
+        # The file is mapped before it is renamed into place, another process
+        # sharing the directory may evict it as soon as it is there
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(variant, n, start, target)
+        tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp')
+        try:
+            with open(tmp, 'wb') as out:
+                if variant == 'classic':
+                    write_binary(out, n, start, target)
+                else:
+                    moves = get_solver(variant).moves(n, start, target)
+                    write_moves(out, moves, 'binary', n=n, start=start, target=target, variant=variant)
+            solution = CachedSolution(tmp)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                solution.close()
+                raise
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()
+        solution.path = os.fspath(path)
+        self.evict()
+        return solution
+
+    def read(self, variant: str, n: int, start: int = 1, target: int = 3, first: int = 0) -> Iterator[Move] | None:
+        """The moves from index ``first`` on when the solution is cached, otherwise None. Never generates it."""
+        solution = self.get(variant, n, start, target)
+        if solution is None:
+            return None
+        return _read(solution, first)
+
+    def moves(self, variant: str, n: int, start: int = 1, target: int = 3, first: int = 0) -> Iterator[Move]:
+        """The solution's moves from index ``first`` on, from the cache when it is worth caching."""
+        if not self.cacheable(variant, n, start, target):
+            if variant == 'classic':
+                yield from hanoi_from(n, first, start, target)
+            else:
+                yield from islice(get_solver(variant).moves(n, start, target), first, None)
+            return
+        with self.open(variant, n, start, target) as solution:
+            yield from solution.moves(first)
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the cache fits in ``max_bytes``.
+
+        Files used since the cache was created are kept, even when that leaves it over the limit.
+        """
+        files = []
+        for path in self.directory.glob('*.hnb'):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files, key=lambda file: file[0]):
+            if total <= self.max_bytes:
+                break
+            if mtime >= self.started:
+                break
+            # Another process may have removed it already, or still have it open on Windows
+            with contextlib.suppress(OSError):
+                path.unlink()
+                total -= size
+
+
+def _read(solution: CachedSolution, first: int) -> Iterator[Move]:
+    with solution:
+        yield from solution.moves(first)
@@ -1,22 +1,97 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import sys
+import time
+from dataclasses import dataclass, replace
 
 from rich.console import Console
+from rich.table import Table
 
 from hanoi import __version__
-from hanoi.solver import hanoi
+from hanoi.batch import JobResult, load_jobs, run_batch
+from hanoi.blocks import verify
+from hanoi.cache import CACHE_ENV, DEFAULT_CACHE_MB, default_cache_dir, solution_cache
+from hanoi.follow import MoveFeed, open_feed
+from hanoi.formats import format_move
+from hanoi.hooks import Hooks, metrics_sink, observe
+from hanoi.log import LOG_POLICIES
+from hanoi.solver import SOLVERS, get_solver, hanoi_from
+from hanoi.state import locate, parse_pegs
 
 console = Console()
 err_console = Console(stderr=True)
 
+VIEWS = ('disks', 'columns', 'heat')
+MAX_DISKS = 15
+MAX_ARRAY_VIEW_DISKS = 30
+
 
 @dataclass
 class Settings:
     n_disks: int
     speed: int
     animate: bool
+    view: str = 'disks'
+    moves_per_frame: int = 1
+    record: str | None = None
+    replay: str | None = None
+    metrics: str | None = None
+    play: bool = False
+    variant: str = 'classic'
+    resume: str | None = None
+    follow: str | None = None
+    quiet: bool = False
+    log_policy: str = 'coalesce'
+    cache_dir: str | None = None
+    cache_size: int = DEFAULT_CACHE_MB
+
+
+MAX_BICOLOR_DISKS = 8
+
+
+def max_disks(view: str, variant: str = 'classic') -> int:
+    """Largest tower that can be shown in ``view``; disks become sub-pixel past 15 in the disk view."""
+    if variant == 'bicolor':
+        # Two disks per size, the stack would run off the top of the pegs
+        return MAX_BICOLOR_DISKS
+    return MAX_DISKS if view == 'disks' else MAX_ARRAY_VIEW_DISKS
+
+
+@dataclass
+class BatchSettings:
+    jobs_file: str
+    workers: int | None
+    cache_dir: str | None = None
+    cache_size: int = DEFAULT_CACHE_MB
+
+
+@dataclass
+class VerifySettings:
+    files: list[str]
+    cache_dir: str | None = None
+    cache_size: int = DEFAULT_CACHE_MB
+
+
+def add_cache_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        default=default_cache_dir(),
+        help=f'keep long solutions in DIR and read them back instead of solving again (default: ${CACHE_ENV})',
+    )
+    p.add_argument(
+        '--cache-size',
+        metavar='MB',
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        help='remove the least recently used solutions once the cache is over MB megabytes',
+    )
+
+
+def check_cache_args(p: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.cache_size < 1:
+        p.error('--cache-size must be at least 1')
 
 
 def parse_args(argv: list[str] | None = None) -> Settings:
@@ -25,45 +100,266 @@ def parse_args(argv: list[str] | None = None) -> Settings:
     p.add_argument('n_disks', nargs='?', type=int, default=3, help='number of disks (1..10)')
     p.add_argument('--speed', type=int, default=15, help='pixels per frame (movement speed)')
     p.add_argument('--no-animate', action='store_true', help='print moves only; do not open a window')
+    p.add_argument(
+        '--view',
+        choices=VIEWS,
+        default='disks',
+        help=f'how to draw the board; columns and heat handle up to {MAX_ARRAY_VIEW_DISKS} disks (need numpy)',
+    )
+    p.add_argument(
+        '--moves-per-frame', type=int, default=1, help='moves applied per frame in the columns and heat views'
+    )
+    session = p.add_mutually_exclusive_group()
+    session.add_argument('--record', metavar='FILE', help='record input events with their frame numbers to FILE')
+    session.add_argument(
+        '--replay',
+        metavar='FILE',
+        help='replay a recorded session without a window and unthrottled, then print frame times',
+    )
+    p.add_argument('--variant', choices=list(SOLVERS), default='classic', help='which puzzle to solve')
+    p.add_argument('--play', action='store_true', help='move the disks yourself, with hints (h) on request')
+    p.add_argument(
+        '--resume',
+        metavar='PEGS',
+        help='start from a saved board, given as the peg of each disk smallest first (e.g. 3312); sets n_disks',
+    )
+    p.add_argument(
+        '--follow',
+        metavar='SOURCE',
+        help='animate moves read from SOURCE (a file, or - for stdin) in the text, CSV or binary format',
+    )
+    p.add_argument('--quiet', action='store_true', help='do not echo moves to the console while animating')
+    p.add_argument(
+        '--log-policy',
+        choices=LOG_POLICIES,
+        default='coalesce',
+        help='when the console falls behind the animation, keep the latest move (coalesce) or the oldest (drop)',
+    )
+    p.add_argument(
+        '--metrics',
+        metavar='FILE',
+        help='export move, frame and pause metrics to FILE (.prom for a Prometheus textfile, else JSON lines)',
+    )
+    add_cache_args(p)
     args = p.parse_args(argv)
+    check_cache_args(p, args)
 
+    if args.play and args.variant != 'classic':
+        p.error('--play only supports the classic variant')
+    if args.play and args.no_animate:
+        p.error('--play needs a window, it cannot be combined with --no-animate')
+    if args.variant == 'bicolor' and args.view != 'disks':
+        p.error('the bicolor variant can only be shown in the disks view')
+
+    if args.follow is not None:
+        if args.play or args.resume is not None:
+            p.error('--follow cannot be combined with --play or --resume')
+        if args.record or args.replay:
+            p.error('--follow sessions cannot be recorded or replayed, the stream is not part of the recording')
+        if args.variant == 'bicolor':
+            p.error('--follow does not support the bicolor variant')
+
+    limit = max_disks(args.view, args.variant)
     n = args.n_disks
+    if args.resume is not None:
+        if args.variant != 'classic':
+            p.error('--resume only supports the classic variant')
+        try:
+            pegs = parse_pegs(args.resume)
+        except ValueError as e:
+            p.error(str(e))
+        if len(pegs) > limit:
+            p.error(f'board {args.resume} has {len(pegs)} disks, the {args.view} view shows at most {limit}')
+        position = locate(pegs)
+        # Players may continue from anywhere, the solver needs a point on its path
+        if not args.play and not position.on_path:
+            p.error(f'board {args.resume} is not on the optimal path, it is {position.distance} moves away from it')
+        n = len(pegs)
+
     if n < 1:
         console.print('[yellow]Invalid number of disks. Using 3.[/]')
         n = 3
-    if n > 15:
-        console.print('[yellow]Too many disks. Using 15.[/]')
-        n = 15
+    if n > limit:
+        console.print(f'[yellow]Too many disks. Using {limit}.[/]')
+        n = limit
 
     speed = max(1, args.speed)
 
-    return Settings(n_disks=n, speed=speed, animate=not args.no_animate)
+    return Settings(
+        n_disks=n,
+        speed=speed,
+        animate=not args.no_animate,
+        view=args.view,
+        moves_per_frame=max(1, args.moves_per_frame),
+        record=args.record,
+        replay=args.replay,
+        metrics=args.metrics,
+        play=args.play,
+        variant=args.variant,
+        resume=args.resume,
+        follow=args.follow,
+        quiet=args.quiet,
+        log_policy=args.log_policy,
+        cache_dir=args.cache_dir,
+        cache_size=args.cache_size,
+    )
+
+
+def parse_batch_args(argv: list[str]) -> BatchSettings:
+    p = argparse.ArgumentParser(prog='hanoi-viz batch', description='Solve many puzzles from a job file.')
+    p.add_argument('jobs_file', help='JSON lines file, one job per line: {"n", "start", "target", "format", "output"}')
+    p.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: number of CPUs)')
+    add_cache_args(p)
+    args = p.parse_args(argv)
+    check_cache_args(p, args)
+
+    if args.workers is not None and args.workers < 1:
+        p.error('--workers must be at least 1')
+
+    return BatchSettings(
+        jobs_file=args.jobs_file, workers=args.workers, cache_dir=args.cache_dir, cache_size=args.cache_size
+    )
+
+
+def parse_verify_args(argv: list[str]) -> VerifySettings:
+    p = argparse.ArgumentParser(
+        prog='hanoi-viz verify', description='Check binary move files against the optimal solution.'
+    )
+    p.add_argument('files', nargs='+', metavar='FILE', help='binary move file, as written by a batch job')
+    add_cache_args(p)
+    args = p.parse_args(argv)
+    check_cache_args(p, args)
+    return VerifySettings(files=args.files, cache_dir=args.cache_dir, cache_size=args.cache_size)
+
+
+def build_hooks(settings: Settings) -> Hooks:
+    hooks = Hooks()
+    if settings.metrics:
+        hooks.register(metrics_sink(settings.metrics))
+    return hooks
+
+
+def follow_settings(settings: Settings, feed: MoveFeed) -> Settings:
+    """``settings`` for following ``feed``: its number of disks, and its variant when the stream records one.
 
+    A ``--variant`` other than the default must match the stream's.
+    """
+    variant = feed.header.variant or settings.variant
+    if settings.variant not in ('classic', variant):
+        raise ValueError(f'the stream solves the {variant} variant, not {settings.variant}')
+    if variant == 'bicolor':
+        raise ValueError('--follow does not support the bicolor variant')
+    return replace(settings, n_disks=feed.n, variant=variant)
 
-def run_headless(settings: Settings) -> None:
-    width_moves = len(str(2**settings.n_disks - 1))
+
+def run_headless(settings: Settings, hooks: Hooks | None = None) -> None:
+    feed = None
+    if settings.follow:
+        # The stream is checked as it is printed, a bad move stops it with an error
+        feed = open_feed(settings.follow, settings.n_disks)
+        settings = follow_settings(settings, feed)
+    solver = get_solver(settings.variant)
+    width_moves = len(str(solver.count(settings.n_disks, 1, 3)))
     width_disk = len(str(settings.n_disks))
-    for i, (disk, from_, to) in enumerate(hanoi(settings.n_disks), 1):
-        console.print(f'{i:{width_moves}}: Move disk {disk:{width_disk}} from peg {from_} to {to}.')
+    cache = solution_cache(settings.cache_dir, settings.cache_size)
+    first = locate(parse_pegs(settings.resume)).index if settings.resume and feed is None else 0
+    if feed is not None:
+        moves = iter(feed)
+    elif cache is not None:
+        moves = cache.moves(settings.variant, settings.n_disks, 1, 3, first)
+    elif first:
+        moves = hanoi_from(settings.n_disks, first)
+    else:
+        moves = solver.moves(settings.n_disks, 1, 3)
+    for i, (disk, from_, to) in enumerate(observe(moves, hooks, first + 1), first + 1):
+        console.print(format_move(i, disk, from_, to, width_moves, width_disk))
+
+
+def run_batch_file(settings: BatchSettings) -> None:
+    jobs = load_jobs(settings.jobs_file)
+    start = time.perf_counter()
+    results = run_batch(jobs, settings.workers, solution_cache(settings.cache_dir, settings.cache_size))
+    print_batch_summary(results, time.perf_counter() - start)
+
+
+def run_verify(settings: VerifySettings) -> None:
+    """Print whether each file holds the optimal solution for its header. Exits with 1 if any does not."""
+    cache = solution_cache(settings.cache_dir, settings.cache_size)
+    failed = False
+    for path in settings.files:
+        try:
+            with open(path, 'rb') as f:
+                wrong = verify(f, cache)
+        except (OSError, ValueError) as e:
+            console.print(f'[red]{path}: {e}')
+            failed = True
+            continue
+        if wrong is None:
+            console.print(f'[green]{path}: ok')
+        else:
+            console.print(f'[red]{path}: move {wrong:,} is not the optimal one')
+            failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+def print_batch_summary(results: list[JobResult], wall_seconds: float) -> None:
+    table = Table(title=f'{len(results)} jobs')
+    for column in ('#', 'variant', 'n', 'pegs', 'format', 'output', 'moves', 'time (s)', 'moves/s'):
+        justify = 'right' if column in ('#', 'n', 'moves', 'time (s)', 'moves/s') else 'left'
+        table.add_column(column, justify=justify)
+
+    for i, result in enumerate(results, 1):
+        job = result.job
+        table.add_row(
+            str(i),
+            job.variant,
+            str(job.n),
+            f'{job.start}->{job.target}',
+            job.format,
+            job.output or '-',
+            f'{result.moves:,}',
+            f'{result.seconds:.3f}',
+            f'{result.throughput:,.0f}',
+        )
+
+    total_moves = sum(result.moves for result in results)
+    throughput = total_moves / wall_seconds if wall_seconds > 0 else float('inf')
+    table.add_section()
+    table.add_row('', '', '', '', '', 'total', f'{total_moves:,}', f'{wall_seconds:.3f}', f'{throughput:,.0f}')
+    console.print(table)
 
 
 def main(argv: list[str] | None = None) -> None:
-    settings = parse_args(argv)
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ['batch']:
+        settings = parse_batch_args(args[1:])
+    elif args[:1] == ['verify']:
+        settings = parse_verify_args(args[1:])
+    else:
+        settings = parse_args(args)
 
+    hooks = build_hooks(settings) if isinstance(settings, Settings) else Hooks()
     try:
-        if not settings.animate:
-            run_headless(settings)
+        if isinstance(settings, BatchSettings):
+            run_batch_file(settings)
+        elif isinstance(settings, VerifySettings):
+            run_verify(settings)
+        elif not settings.animate:
+            run_headless(settings, hooks)
         else:
             # Import pygame only when needed
             from hanoi.game import run_pygame
 
-            run_pygame(settings)
+            run_pygame(settings, hooks)
 
     except KeyboardInterrupt:
         console.print('[yellow]interrupted, quitting...[/]')
     except Exception as e:
         err_console.print(f'[bold red]Error:[/] {e}')
         raise
+    finally:
+        hooks.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,140 @@
+"""Follow a move stream from another program, read and checked on a background thread."""
+
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+from collections.abc import Iterator
+from itertools import chain
+from typing import BinaryIO
+
+from hanoi.formats import read_moves
+from hanoi.solver import PEGS, Move, check_pegs
+from hanoi.state import Board, IllegalMove
+
+FOLLOW_QUEUE_SIZE = 1024
+
+
+class MoveFeed:
+    """Moves from a stream, parsed and validated on a daemon thread and handed over through a bounded queue.
+
+    The thread is the only one that blocks: on I/O while the stream is quiet,
+    and on the full queue while the consumer is behind, which in turn holds
+    back whatever writes to the stream. ``get`` never waits.
+
+    The header, and for text and CSV streams the first move, are read before
+    the thread starts, because they tell where the tower starts. Only the
+    binary format records the number of disks, ``n`` is used for the others.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        n: int | None = None,
+        maxsize: int = FOLLOW_QUEUE_SIZE,
+        close_stream: bool = False,
+    ):
+        self.header, moves = read_moves(stream)
+        self.n = self.header.n or n
+        if not self.n:
+            raise ValueError(f'{self.header.format} streams do not record the number of disks, it must be given')
+        first = next(moves, None)
+        # Every disk starts on one peg, so the first move is always disk 1 leaving it
+        self.start = self.header.start or (first[1] if first else 1)
+        self.target = self.header.target
+        if self.target is not None:
+            check_pegs(self.start, self.target)
+        elif self.start not in PEGS:
+            raise ValueError(f'the tower must start on one of pegs {PEGS}, got {self.start}')
+        self.maxsize = maxsize
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.done = False
+        self.error: Exception | None = None
+        self.solved = False
+        self._stop = threading.Event()
+        moves = chain([first], moves) if first else moves
+        self._thread = threading.Thread(target=self._produce, args=(stream, moves, close_stream), daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Moves waiting in the queue."""
+        return self.queue.qsize()
+
+    def get(self) -> Move | None:
+        """The next move if one is ready, otherwise None. Check ``done`` to tell the end from a pause."""
+        if self.done:
+            return None
+        try:
+            item = self.queue.get_nowait()
+        except queue.Empty:
+            return None
+        if isinstance(item, tuple):
+            return item
+        self._end(item)
+        return None
+
+    def __iter__(self) -> Iterator[Move]:
+        """Every move, waiting for each one. Raises the reader's error when the stream is bad."""
+        while not self.done:
+            item = self.queue.get()
+            if isinstance(item, tuple):
+                yield item
+            else:
+                self._end(item)
+        if self.error is not None:
+            raise self.error
+
+    def close(self) -> None:
+        """Stop the reader at its next move. A read already waiting on the stream is left to the daemon thread."""
+        self._stop.set()
+
+    def _end(self, item: Exception | None) -> None:
+        self.done = True
+        self.error = item
+
+    def _produce(self, stream: BinaryIO, moves: Iterator[Move], close_stream: bool) -> None:
+        result = None
+        try:
+            board = Board.initial(self.n, self.start)
+            for i, (disk, from_, to) in enumerate(moves, 1):
+                if from_ not in PEGS or to not in PEGS:
+                    raise ValueError(f'move {i}: pegs must be one of {PEGS}, got {from_} and {to}')
+                if board.top(from_) != disk:
+                    raise IllegalMove(f'move {i}: disk {disk} is not on top of peg {from_}')
+                try:
+                    board.move(from_, to)
+                except IllegalMove as e:
+                    raise IllegalMove(f'move {i}: {e}') from None
+                if not self._put((disk, from_, to)):
+                    return
+            targets = [self.target] if self.target else [peg for peg in PEGS if peg != self.start]
+            self.solved = any(board.is_solved(peg) for peg in targets)
+        except (ValueError, OSError) as e:
+            result = e
+        finally:
+            if close_stream:
+                stream.close()
+        self._put(result)
+
+    def _put(self, item: Move | Exception | None) -> bool:
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def open_feed(source: str, n: int | None = None) -> MoveFeed:
+    """Follow ``source``, a file name or ``-`` for standard input."""
+    # Closed by the reader thread once the stream ends. Standard input gets a reader of its
+    # own: the interpreter cannot shut down while a daemon thread holds sys.stdin's lock.
+    stream = open(sys.stdin.fileno(), 'rb', closefd=False) if source == '-' else open(source, 'rb')  # noqa: SIM115
+    try:
+        return MoveFeed(stream, n, close_stream=True)
+    except BaseException:
+        stream.close()
+        raise
@@ -0,0 +1,188 @@
+"""Serialization of move sequences to text, CSV and a packed binary format."""
+
+from __future__ import annotations
+
+import re
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import chain
+from typing import BinaryIO
+
+from hanoi.solver import Move
+
+FORMATS = ('text', 'csv', 'binary')
+EXTENSIONS = {'text': 'txt', 'csv': 'csv', 'binary': 'hnb'}
+
+# Binary layout: a 10 byte header (magic, version, n, start, target, variant and a
+# padding byte) followed by one little-endian uint16 per move packed as
+# ``disk << 4 | from << 2 | to``.
+MAGIC = b'HNOI'
+VERSION = 2
+HEADER = struct.Struct('<4sBBBBBx')
+MOVE_SIZE = 2
+# Variants by their number in the header; new ones are appended
+BINARY_VARIANTS = ('classic', 'cyclic', 'adjacent', 'bicolor')
+# The header has one byte for the number of disks
+MAX_BINARY_DISKS = 255
+
+# Number of moves buffered before each write.
+CHUNK_MOVES = 1 << 14
+
+CSV_HEADER = b'move,disk,from,to'
+TEXT_MOVE = re.compile(rb'\s*\d+: Move disk\s+(\d+) from peg (\d) to (\d)\.\s*')
+
+
+def pack_move(disk: int, from_: int, to: int) -> int:
+    return disk << 4 | from_ << 2 | to
+
+
+def unpack_move(packed: int) -> Move:
+    return packed >> 4, (packed >> 2) & 0b11, packed & 0b11
+
+
+def pack_header(n: int, start: int, target: int, variant: str = 'classic') -> bytes:
+    if variant not in BINARY_VARIANTS:
+        raise ValueError(f'the binary format cannot record variant {variant!r}')
+    return HEADER.pack(MAGIC, VERSION, n, start, target, BINARY_VARIANTS.index(variant))
+
+
+def unpack_header(data: bytes) -> tuple[int, int, int, str]:
+    """The disks, start, target and variant recorded in a binary header. Raises ValueError if it is not one."""
+    if len(data) < HEADER.size or data[: len(MAGIC)] != MAGIC:
+        raise ValueError('not a binary move file')
+    _, version, n, start, target, variant = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f'unsupported binary format version {version}')
+    if variant >= len(BINARY_VARIANTS):
+        raise ValueError(f'unknown variant number {variant} in the header')
+    return n, start, target, BINARY_VARIANTS[variant]
+
+
+def format_move(i: int, disk: int, from_: int, to: int, width_moves: int, width_disk: int) -> str:
+    """Format a move the way it is printed on the console."""
+    return f'{i:{width_moves}}: Move disk {disk:{width_disk}} from peg {from_} to {to}.'
+
+
+def write_moves(
+    out: BinaryIO,
+    moves: Iterable[Move],
+    fmt: str,
+    *,
+    n: int,
+    start: int = 1,
+    target: int = 3,
+    total_moves: int | None = None,
+    variant: str = 'classic',
+) -> int:
+    """Write ``moves`` to the binary stream ``out`` in ``fmt``. Returns the number of moves written.
+
+    ``total_moves`` only sets the column width of the text format, it defaults
+    to the length of the classic solution. ``variant`` is recorded in the
+    binary header.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'unknown format {fmt!r}, expected one of {FORMATS}')
+
+    if fmt == 'binary':
+        out.write(pack_header(n, start, target, variant))
+        encode = _encode_binary
+    elif fmt == 'csv':
+        out.write(CSV_HEADER + b'\n')
+        encode = _encode_csv
+    else:
+        width_moves, width_disk = len(str(total_moves or 2**n - 1)), len(str(n))
+
+        def encode(chunk: list[tuple[int, Move]]) -> bytes:
+            lines = [format_move(i, disk, from_, to, width_moves, width_disk) for i, (disk, from_, to) in chunk]
+            return ('\n'.join(lines) + '\n').encode()
+
+    count = 0
+    chunk: list[tuple[int, Move]] = []
+    for count, move in enumerate(moves, 1):
+        chunk.append((count, move))
+        if len(chunk) == CHUNK_MOVES:
+            out.write(encode(chunk))
+            chunk = []
+    if chunk:
+        out.write(encode(chunk))
+    return count
+
+
+def _encode_binary(chunk: list[tuple[int, Move]]) -> bytes:
+    return struct.pack(f'<{len(chunk)}H', *(pack_move(*move) for _, move in chunk))
+
+
+def _encode_csv(chunk: list[tuple[int, Move]]) -> bytes:
+    return ''.join(f'{i},{disk},{from_},{to}\n' for i, (disk, from_, to) in chunk).encode()
+
+
+@dataclass(frozen=True)
+class StreamHeader:
+    """What the start of a move stream says about it. Only the binary format records the puzzle."""
+
+    format: str
+    n: int | None = None
+    start: int | None = None
+    target: int | None = None
+    variant: str | None = None
+
+
+def read_moves(stream: BinaryIO) -> tuple[StreamHeader, Iterator[Move]]:
+    """Read moves written by ``write_moves``, detecting the format from the first bytes.
+
+    The header is read straight away; moves are yielded as soon as they arrive,
+    so ``stream`` can be a pipe from a solver that is still running. Input that
+    does not parse raises ValueError.
+    """
+    head = stream.read(len(MAGIC))
+    if head == MAGIC:
+        rest = stream.read(HEADER.size - len(MAGIC))
+        if len(rest) < HEADER.size - len(MAGIC):
+            raise ValueError('binary stream ends inside its header')
+        n, start, target, variant = unpack_header(head + rest)
+        return StreamHeader('binary', n, start, target, variant), _read_binary(stream)
+
+    first = head + stream.readline()
+    if first.strip() == CSV_HEADER:
+        return StreamHeader('csv'), _read_lines(stream, _parse_csv, 2)
+    return StreamHeader('text'), _read_lines(chain([first], stream), _parse_text, 1)
+
+
+def _read_binary(stream: BinaryIO) -> Iterator[Move]:
+    # read1 returns whatever has arrived instead of waiting for a full chunk
+    read = getattr(stream, 'read1', stream.read)
+    pending = b''
+    while True:
+        data = read(CHUNK_MOVES * MOVE_SIZE)
+        if not data:
+            break
+        data = pending + data
+        end = len(data) - len(data) % MOVE_SIZE
+        for (packed,) in struct.iter_unpack('<H', data[:end]):
+            yield unpack_move(packed)
+        pending = data[end:]
+    if pending:
+        raise ValueError('binary stream ends in the middle of a move')
+
+
+def _read_lines(lines: Iterable[bytes], parse, first_line: int) -> Iterator[Move]:
+    for line_no, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        move = parse(line)
+        if move is None:
+            raise ValueError(f'line {line_no}: not a move: {line.decode(errors="replace").strip()!r}')
+        yield move
+
+
+def _parse_text(line: bytes) -> Move | None:
+    match = TEXT_MOVE.fullmatch(line)
+    return tuple(map(int, match.groups())) if match else None
+
+
+def _parse_csv(line: bytes) -> Move | None:
+    fields = line.split(b',')
+    if len(fields) != 4 or not all(field.strip().isdigit() for field in fields):
+        return None
+    return int(fields[1]), int(fields[2]), int(fields[3])
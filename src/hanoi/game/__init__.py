@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import os
+from dataclasses import replace
+
 import pygame
 from rich.console import Console
 
-from hanoi.cli import Settings
+from hanoi.cli import Settings, follow_settings, max_disks
+from hanoi.follow import open_feed
+from hanoi.hooks import Hooks
+from hanoi.log import BackgroundLog
 
 from .constants import CAPTION, HEIGHT, WIDTH
+from .events import EventSource, ReplaySource
 from .exceptions import QuitGame, ReturnToStartScreen
 from .game import Game
 from .start_screen import StartScreen
@@ -15,37 +22,90 @@ from .start_screen import StartScreen
 console = Console()
 
 
-def run_pygame(settings: Settings) -> None:
+def run_pygame(settings: Settings, hooks: Hooks | None = None) -> None:
     """Run the pygame-based Towers of Hanoi game.
 
     Args:
         settings: Game settings including number of disks and animation speed.
+        hooks: Observers notified of moves, frames, pauses and the finish.
     """
+    if settings.replay:
+        # Replays run without a window
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+    events = None
+    feed = None
+    # Shared by every game of the session and closed last, so messages stay in order
+    log = BackgroundLog(console, settings.log_policy, quiet=settings.quiet)
     try:
+        if settings.follow:
+            # Opened before the window: reading the header waits for the producer, and a window
+            # that is not handling events meanwhile would freeze
+            feed = open_feed(settings.follow, settings.n_disks)
+            settings = follow_settings(settings, feed)
+            limit = max_disks(settings.view, settings.variant)
+            if feed.n > limit:
+                raise ValueError(f'the stream has {feed.n} disks, the {settings.view} view shows at most {limit}')
+
         pygame.init()
         screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption(CAPTION)
+
+        if settings.replay:
+            events = ReplaySource(settings.replay)
+            # Replay with the settings the session was recorded with
+            if events.settings is not None:
+                settings = replace(events.settings, record=None, replay=settings.replay)
+        else:
+            events = EventSource(settings.record, settings)
         current_settings = settings
 
+        if feed is not None:
+            # A stream cannot be rewound, so there is no start screen and a restart ends the session
+            try:
+                Game(settings, events, hooks, feed, log).run()
+            except ReturnToStartScreen:
+                log.print('[blue]the stream cannot be restarted, quitting...')
+            return
+
         # Main loop: start screen -> game -> start screen (on restart)
         while True:
             # Show start screen
-            start_screen = StartScreen(screen, current_settings)
+            start_screen = StartScreen(screen, current_settings, events)
             final_settings = start_screen.run()
             current_settings = final_settings
 
             # Create game with final settings (pygame already initialized)
-            game = Game(final_settings)
+            game = Game(final_settings, events, hooks, log=log)
             try:
                 game.run()
             except ReturnToStartScreen:
                 # Return to start screen with current settings
-                console.print('[blue]returning to start...')
+                log.print('[blue]returning to start...')
                 continue
     except QuitGame:
-        console.print('[blue]quitting game...')
+        log.print('[blue]quitting game...')
     except KeyboardInterrupt:
-        console.print('[yellow]received interrupt, quitting game...')
+        log.print('[yellow]received interrupt, quitting game...')
+    finally:
+        if feed is not None:
+            feed.close()
+        if events is not None:
+            events.close()
+        log.close()
+        if isinstance(events, ReplaySource):
+            _print_frame_times(events)
+
+
+def _print_frame_times(replay: ReplaySource) -> None:
+    stats = replay.frame_time_stats()
+    if not stats['frames']:
+        console.print('[blue]replay produced no frames')
+        return
+    console.print(
+        f'[blue]replayed {stats["frames"]:,} frames:[/] '
+        + ', '.join(f'{name} {stats[name]:.3f} ms' for name in ('mean', 'p50', 'p95', 'p99', 'max'))
+    )
 
 
 __all__ = ['run_pygame']
@@ -0,0 +1,125 @@
+"""Array-backed views for towers with too many disks to draw one rect per disk.
+
+The board state is kept in a NumPy image that is patched in place as moves land
+and pushed to the screen with ``pygame.surfarray``, so the cost of a frame does
+not depend on the number of disks.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError("large views need numpy, install it with: pip install 'hanoi-viz[large]'") from e
+
+import pygame
+
+from .colors import Color
+from .constants import PEG_WIDTH, WIDTH
+
+
+class ArrayView(ABC):
+    """Base class for views that render the board from a NumPy image."""
+
+    def __init__(self, rect: pygame.Rect, n_disks: int, stacks: dict[int, list[int]], shape: tuple[int, int]):
+        self.rect = rect
+        self.n_disks = n_disks
+        self.stacks = {peg: list(stacks.get(peg, [])) for peg in (1, 2, 3)}
+        self.background = np.empty((*shape, 3), dtype=np.uint8)
+        self.background[...] = Color.WHITE
+        self._draw_background()
+        self.pixels = self.background.copy()
+        for peg, stack in self.stacks.items():
+            for level, disk in enumerate(stack):
+                self._paint(peg, level, disk)
+        self.surface = pygame.Surface(shape)
+        self.dirty = True
+
+    def color(self, disk: int) -> tuple[int, int, int]:
+        """Same palette as the disk view: the bottom disk takes the first color."""
+        return Color.DISK_COLORS[(self.n_disks - disk) % len(Color.DISK_COLORS)]
+
+    def move(self, disk: int, from_peg: int, to_peg: int) -> None:
+        """Apply a single move, touching only the pixels of the moved disk."""
+        from_stack, to_stack = self.stacks[from_peg], self.stacks[to_peg]
+        from_stack.pop()
+        self._clear(from_peg, len(from_stack), disk)
+        self._paint(to_peg, len(to_stack), disk)
+        to_stack.append(disk)
+        self.dirty = True
+
+    def draw(self, screen: pygame.Surface) -> None:
+        if self.dirty:
+            pygame.surfarray.blit_array(self.surface, self.pixels)
+            self.dirty = False
+        self._blit(screen)
+
+    def _blit(self, screen: pygame.Surface) -> None:
+        screen.blit(self.surface, self.rect)
+
+    def _draw_background(self) -> None:  # noqa: B027 - optional, only some views have a background
+        pass
+
+    @abstractmethod
+    def _paint(self, peg: int, level: int, disk: int) -> None: ...
+
+    @abstractmethod
+    def _clear(self, peg: int, level: int, disk: int) -> None: ...
+
+
+class ColumnView(ArrayView):
+    """Each peg's stack drawn as a column image with disk widths proportional to size."""
+
+    def __init__(self, rect: pygame.Rect, n_disks: int, stacks: dict[int, list[int]]):
+        self.column_width = WIDTH // 4 - 20
+        # Row boundaries of each stack level, level 0 at the bottom of the image
+        self.edges = np.linspace(rect.height, 0, n_disks + 1).round().astype(int)
+        self.gap = 1 if rect.height // n_disks >= 3 else 0
+        super().__init__(rect, n_disks, stacks, (rect.width, rect.height))
+
+    def _peg_x(self, peg: int) -> int:
+        return peg * WIDTH // 4 - self.rect.left
+
+    def _draw_background(self) -> None:
+        for peg in (1, 2, 3):
+            x = self._peg_x(peg)
+            self.background[x - PEG_WIDTH // 2 : x + PEG_WIDTH - PEG_WIDTH // 2, :] = Color.BLACK
+
+    def _band(self, level: int) -> slice:
+        return slice(self.edges[level + 1], self.edges[level] - self.gap)
+
+    def _paint(self, peg: int, level: int, disk: int) -> None:
+        x = self._peg_x(peg)
+        half = max(1, round(disk / self.n_disks * self.column_width / 2))
+        self.pixels[x - half : x + half, self._band(level)] = self.color(disk)
+
+    def _clear(self, peg: int, level: int, disk: int) -> None:
+        x = self._peg_x(peg)
+        half = max(1, round(disk / self.n_disks * self.column_width / 2))
+        band = self._band(level)
+        self.pixels[x - half : x + half, band] = self.background[x - half : x + half, band]
+
+
+class HeatStripView(ArrayView):
+    """One cell per (disk, peg): a lit cell shows which peg holds each disk, largest disk on the left."""
+
+    def __init__(self, rect: pygame.Rect, n_disks: int, stacks: dict[int, list[int]]):
+        super().__init__(rect, n_disks, stacks, (n_disks, 3))
+
+    def _paint(self, peg: int, level: int, disk: int) -> None:
+        self.pixels[self.n_disks - disk, peg - 1] = self.color(disk)
+
+    def _clear(self, peg: int, level: int, disk: int) -> None:
+        self.pixels[self.n_disks - disk, peg - 1] = Color.WHITE
+
+    def _blit(self, screen: pygame.Surface) -> None:
+        screen.blit(pygame.transform.scale(self.surface, self.rect.size), self.rect)
+        pygame.draw.rect(screen, Color.BLACK, self.rect, 1)
+
+
+ARRAY_VIEWS: dict[str, type[ArrayView]] = {
+    'columns': ColumnView,
+    'heat': HeatStripView,
+}
@@ -31,3 +31,5 @@ class Color:
         LIGHT_BLUE,
         LIGHT_PURPLE,
     ]
+
+    BICOLOR: List[Tuple[int, int, int]] = [RED, BLUE]
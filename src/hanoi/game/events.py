@@ -0,0 +1,148 @@
+"""Event and frame clock sources, with recording and deterministic replay."""
+
+from __future__ import annotations
+
+import json
+import time
+from array import array
+from collections import defaultdict
+from dataclasses import asdict
+
+import pygame
+
+from hanoi.cli import Settings
+
+from .constants import FPS
+from .exceptions import QuitGame
+
+RECORDING_VERSION = 1
+
+# Event types worth recording and the attributes needed to rebuild them
+RECORDED_EVENTS: dict[int, tuple[str, ...]] = {
+    pygame.QUIT: (),
+    pygame.KEYDOWN: ('key', 'mod', 'unicode', 'scancode'),
+    pygame.MOUSEBUTTONDOWN: ('pos', 'button'),
+}
+
+
+class EventSource:
+    """Live pygame events and frame clock.
+
+    Every screen polls events and ends its frames through one shared source, so
+    a whole session (start screen and games) has a single frame counter. When
+    ``record_path`` is given, events are written there with the frame they
+    arrived on, and time is counted in frames so a replay sees the same clock.
+    """
+
+    def __init__(self, record_path: str | None = None, settings: Settings | None = None):
+        self.frame = 0
+        self.poll = 0
+        self.clock = pygame.time.Clock()
+        self.fixed_timestep = record_path is not None
+        self.record_file = None
+        if record_path is not None:
+            # Closed in close(), the file stays open for the whole session
+            self.record_file = open(record_path, 'w')  # noqa: SIM115
+            header = {'version': RECORDING_VERSION, 'settings': asdict(settings) if settings else None}
+            self.record_file.write(json.dumps(header) + '\n')
+
+    def get(self) -> list[pygame.event.Event]:
+        """Return the pending events, like ``pygame.event.get``."""
+        events = pygame.event.get()
+        if self.record_file is not None:
+            for event in events:
+                if event.type in RECORDED_EVENTS:
+                    self._record(event)
+        self.poll += 1
+        return events
+
+    def tick(self) -> int:
+        """End the current frame. Returns the milliseconds it took."""
+        self.frame += 1
+        self.poll = 0
+        return self.clock.tick(FPS)
+
+    def close(self) -> None:
+        if self.record_file is not None:
+            self.record_file.write(json.dumps({'end': self.frame}) + '\n')
+            self.record_file.close()
+            self.record_file = None
+
+    def _record(self, event: pygame.event.Event) -> None:
+        attrs = {name: getattr(event, name) for name in RECORDED_EVENTS[event.type] if hasattr(event, name)}
+        line = {'frame': self.frame, 'poll': self.poll, 'type': pygame.event.event_name(event.type), **attrs}
+        self.record_file.write(json.dumps(line) + '\n')
+
+
+class ReplaySource(EventSource):
+    """Replays a recording frame for frame.
+
+    Recorded events are posted to the pygame queue on the frame and poll they
+    were recorded on, time advances a fixed 1/FPS per frame, and frames are not
+    throttled, so the wall time of each frame measures only the work done in it.
+    The session ends with ``QuitGame`` once the recording runs out.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.fixed_timestep = True
+        self.schedule: dict[tuple[int, int], list[pygame.event.Event]] = defaultdict(list)
+        self.end_frame = None
+        self.settings = None
+        event_types = {pygame.event.event_name(event_type): event_type for event_type in RECORDED_EVENTS}
+
+        with open(path) as f:
+            header = json.loads(f.readline())
+            if header.get('version') != RECORDING_VERSION:
+                raise ValueError(f'{path}: unsupported recording version {header.get("version")!r}')
+            if header.get('settings'):
+                self.settings = Settings(**header['settings'])
+            for line in f:
+                entry = json.loads(line)
+                if 'end' in entry:
+                    self.end_frame = entry['end']
+                    continue
+                frame, poll, type_name = entry.pop('frame'), entry.pop('poll'), entry.pop('type')
+                if 'pos' in entry:
+                    entry['pos'] = tuple(entry['pos'])
+                self.schedule[frame, poll].append(pygame.event.Event(event_types[type_name], **entry))
+
+        if self.end_frame is None:
+            self.end_frame = max((frame for frame, _ in self.schedule), default=0) + 1
+        self.frame_times = array('d')
+        self._frame_start = time.perf_counter()
+
+    def get(self) -> list[pygame.event.Event]:
+        if self.frame > self.end_frame:
+            raise QuitGame
+        # Drop anything the (dummy) display produced on its own
+        pygame.event.clear()
+        for event in self.schedule.pop((self.frame, self.poll), ()):
+            pygame.event.post(event)
+        return super().get()
+
+    def tick(self) -> int:
+        now = time.perf_counter()
+        self.frame_times.append(now - self._frame_start)
+        self._frame_start = now
+        self.frame += 1
+        self.poll = 0
+        return 1000 // FPS
+
+    def frame_time_stats(self) -> dict[str, float]:
+        """Frame time summary in milliseconds."""
+        times = sorted(self.frame_times)
+        if not times:
+            return {'frames': 0}
+
+        def percentile(p: float) -> float:
+            return times[min(len(times) - 1, int(p * len(times)))] * 1000
+
+        return {
+            'frames': len(times),
+            'mean': sum(times) / len(times) * 1000,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': times[-1] * 1000,
+        }
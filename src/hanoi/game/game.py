@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import time
+from collections import deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 
 import pygame
 from rich.console import Console
 
-from hanoi import hanoi
+from hanoi.cache import solution_cache
 from hanoi.cli import Settings
+from hanoi.formats import format_move
+from hanoi.hooks import Hooks
+from hanoi.log import BackgroundLog
+from hanoi.simulation import Layout, NumberedMove, Simulation
+from hanoi.solver import get_solver, hanoi_from
+from hanoi.state import Board, IllegalMove, parse_pegs
 
 from .colors import Color
 from .constants import (
@@ -27,39 +36,93 @@ from .constants import (
     PRE_START_DELAY_MS,
     WIDTH,
 )
+from .events import EventSource
 from .exceptions import QuitGame, ReturnToStartScreen
 
+if TYPE_CHECKING:
+    from hanoi.follow import MoveFeed
+
+    from .array_view import ArrayView
+
 console = Console()
 
+# Longest frame the animation catches up on, so a stalled window does not teleport the disks
+MAX_FRAME_SECONDS = 0.1
+
+# Keys that pick a peg in play mode
+PEG_KEYS = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 3, pygame.K_KP1: 1, pygame.K_KP2: 2, pygame.K_KP3: 3}
+
 
 class Game:
     """Main game class for Towers of Hanoi."""
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        events: EventSource | None = None,
+        hooks: Hooks | None = None,
+        feed: MoveFeed | None = None,
+        log: BackgroundLog | None = None,
+    ):
         self.settings = settings
+        self.events = events if events is not None else EventSource()
+        self.hooks = hooks
+        # Printing happens off the render loop, a slow terminal must not stall the animation.
+        # A log of the game's own is closed when run() ends, one passed in belongs to the caller.
+        self.owns_log = log is None
+        self.log = log if log is not None else BackgroundLog(console, settings.log_policy, quiet=settings.quiet)
+        # Follow mode animates the moves of another program instead of solving
+        self.feed = feed
+        self.solver = get_solver(self.settings.variant)
+        self.tower = self.solver.tower(self.settings.n_disks)
+        self._last_frame = time.perf_counter()
+        self._dt = 1 / FPS
+
+        # A resumed board continues from its move on the optimal path
+        self.start_board = None
+        self.first_move = 0
+        if self.settings.resume and len(self.settings.resume) == self.settings.n_disks:
+            self.start_board = Board.from_pegs(parse_pegs(self.settings.resume))
+            self.first_move = self.start_board.locate().index or 0
+        if self.start_board is not None:
+            initial_stacks = self.start_board.stacks()
+        else:
+            initial_stacks = {self.feed.start if self.feed else 1: list(self.tower)}
         # pygame.init() is called in run_pygame, so we don't need to call it here
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.board = pygame.Rect(BOARD_POS_LEFT, BOARD_POS_TOP, BOARD_WIDTH, BOARD_HEIGHT)
         self.pegs = self._init_pegs()
-        self.disks = self._init_disks(self.settings.n_disks)
+        self.array_view = self._init_array_view(initial_stacks) if self.settings.view != 'disks' else None
+        self.disks = self._init_disks(self.tower) if self.array_view is None else []
+        # Towers with two disks of each size alternate two colors
+        self.disk_colors = Color.BICOLOR if len(set(self.tower)) < len(self.tower) else Color.DISK_COLORS
 
         left, width, top = self.board.left - 20, self.board.width + 40, self.board.bottom + 10
         self.progress_border = pygame.Rect(left, top, width, 15)
         self.progress_bar = pygame.Rect(left, top, 0, 15)
 
-        self.peg_stacks = defaultdict(list)
-        self.peg_stacks[1].extend(self.disks)
-
-        self.total_moves = 2**self.settings.n_disks - 1
+        self.total_moves = self.solver.count(self.settings.n_disks, 1, 3)
         self.print_spaces = len(str(self.total_moves))
         self.print_disk_spaces = len(str(self.settings.n_disks))
-        self.clock = pygame.time.Clock()
 
         self.finished = False
-        self.paused = False
-        self.step_once = False
         self.show_help = False
 
+        # Play mode: the player moves the disks, checked against a bitmask board
+        self.state = None
+        self.distance = self.total_moves
+        if self.settings.play:
+            self.state = (
+                Board.from_pegs(self.start_board.pegs()) if self.start_board else Board.initial(self.settings.n_disks)
+            )
+            self.distance = self.state.distance()
+        self.selected_peg: int | None = None
+        self.player_moves = 0
+        # Legal player moves waiting to be animated
+        self.player_queue: deque[NumberedMove] = deque()
+
+        self.sim = self._init_simulation(initial_stacks)
+
         # Initialize font for text display
         pygame.font.init()
         self.font = pygame.font.Font(None, 24)
@@ -76,22 +139,78 @@ class Game:
             for peg_num in range(1, 4)
         ]
 
-    def _init_disks(self, n_disks: int) -> list[pygame.Rect]:
-        """Initialize the disks."""
+    def _init_disks(self, tower: list[int]) -> list[pygame.Rect]:
+        """Initialize the disks from their sizes, bottom to top."""
+        widths = {tower[0]: DISK_WIDTH}
+        for size in range(tower[0] - 1, 0, -1):
+            widths[size] = int(widths[size + 1] * 0.9)
+
         disks = []
-        for i in range(n_disks, 0, -1):
-            width = DISK_WIDTH if i == n_disks else int(disks[-1].width * 0.9)
-            disk = pygame.Rect(0, 0, width, DISK_HEIGHT)
+        for i, size in enumerate(tower):
+            disk = pygame.Rect(0, 0, widths[size], DISK_HEIGHT)
             disk.centerx = self.pegs[0].centerx
-            disk.bottom = self.board.top if i == n_disks else disks[-1].top
+            disk.bottom = self.board.top if i == 0 else disks[-1].top
             disks.append(disk)
         return disks
 
+    def _init_simulation(self, stacks: dict[int, list[int]]) -> Simulation:
+        """Build the model of the run that the frames draw."""
+        layout = Layout(
+            peg_x=(self.pegs[0].centerx, self.pegs[1].centerx, self.pegs[2].centerx),
+            base_y=self.board.top,
+            lift_y=LIFT_Y + DISK_HEIGHT // 2,
+            disk_height=DISK_HEIGHT,
+        )
+        if self.start_board is not None:
+            # A board has distinct disks, the disk of size s is the n - s th from the bottom
+            indices = {peg: [self.settings.n_disks - size for size in stack] for peg, stack in stacks.items()}
+        else:
+            indices = {peg: list(range(len(stack))) for peg, stack in stacks.items()}
+        solving = self.state is None and self.feed is None
+        return Simulation(
+            layout,
+            indices,
+            self._move_source(),
+            total_moves=self.total_moves,
+            speed=self.settings.speed * FPS,
+            first_move=self.total_moves - self.distance if self.state is not None else self.first_move,
+            # Give the user a moment to exit, pause or step before the solver starts
+            delay=PRE_START_DELAY_MS / 1000 if solving else 0.0,
+            instant=self.array_view is not None,
+            moves_per_tick=self.settings.moves_per_frame,
+        )
+
+    def _move_source(self) -> Iterator[NumberedMove | None]:
+        """The moves to animate: the player's, the followed stream's or the solver's."""
+        if self.state is not None:
+            return _drain(self.player_queue)
+        if self.feed is not None:
+            return _follow(self.feed)
+        # Only a cached solution is read: generating it first would hold up the render loop, a
+        # miss is solved move by move as usual and the cache is left for headless and batch runs to fill
+        cache = solution_cache(self.settings.cache_dir, self.settings.cache_size)
+        n = self.settings.n_disks
+        moves = cache.read(self.settings.variant, n, 1, 3, self.first_move) if cache is not None else None
+        if moves is None:
+            moves = hanoi_from(n, self.first_move) if self.first_move else self.solver.moves(n, 1, 3)
+        return enumerate(moves, self.first_move + 1)
+
+    def _init_array_view(self, stacks: dict[int, list[int]]) -> ArrayView:
+        """Initialize the numpy-backed view used for large towers."""
+        # Imported here so numpy is only needed when a large view is requested
+        from .array_view import ARRAY_VIEWS
+
+        top = HEIGHT // 5 + 20
+        rect = pygame.Rect(BOARD_POS_LEFT, top, BOARD_WIDTH, self.board.top - top)
+        return ARRAY_VIEWS[self.settings.view](rect, self.settings.n_disks, stacks)
+
     def handle_events(self) -> None:
         """Handle pygame events."""
-        for event in pygame.event.get():
+        for event in self.events.get():
             if event.type == pygame.QUIT:
                 raise QuitGame
+            if event.type == pygame.MOUSEBUTTONDOWN and self.state is not None and not self.show_help:
+                self.select_peg(self._peg_at(event.pos[0]))
             if event.type == pygame.KEYDOWN:
                 # If help is showing, only allow closing it or quitting
                 if self.show_help:
@@ -109,7 +228,7 @@ class Game:
                 # Handle help screen toggle
                 if event.unicode == '?':
                     self.show_help = not self.show_help
-                    if self.show_help and not self.paused and not self.finished:
+                    if self.show_help and not self.paused and not self.finished and self.state is None:
                         # Pause the game when showing help (if game is running)
                         self.paused = True
                         self._update_caption()
@@ -120,7 +239,11 @@ class Game:
                     raise QuitGame
                 if event.key == pygame.K_r:
                     raise ReturnToStartScreen
-                if event.key in (pygame.K_SPACE, pygame.K_p):
+                if self.state is not None and event.key in PEG_KEYS:
+                    self.select_peg(PEG_KEYS[event.key])
+                elif self.state is not None and event.key == pygame.K_h:
+                    self.show_hint()
+                elif event.key in (pygame.K_SPACE, pygame.K_p):
                     self.paused = not self.paused
                     if not self.paused:
                         # Resuming from pause - exit step mode to allow continuous running
@@ -131,14 +254,41 @@ class Game:
                     if self.paused:
                         self.paused = False
                     self._update_caption()
+                elif event.key == pygame.K_f and self.array_view is not None:
+                    self.settings.moves_per_frame *= 2
+                    self.log.print(f'moves per frame increased to: {self.settings.moves_per_frame}')
+                elif event.key == pygame.K_s and self.array_view is not None:
+                    self.settings.moves_per_frame = max(1, self.settings.moves_per_frame // 2)
+                    self.log.print(f'moves per frame decreased to: {self.settings.moves_per_frame}')
                 elif event.key == pygame.K_f:
                     self.settings.speed += 10
-                    console.print(f'speed increased to: {self.settings.speed}')
+                    self.log.print(f'speed increased to: {self.settings.speed}')
                 elif event.key == pygame.K_s:
                     self.settings.speed -= 10
                     if self.settings.speed < 10:
                         self.settings.speed = 10
-                    console.print(f'speed decreased to: {self.settings.speed}')
+                    self.log.print(f'speed decreased to: {self.settings.speed}')
+                self.sim.speed = self.settings.speed * FPS
+                self.sim.moves_per_tick = self.settings.moves_per_frame
+
+    @property
+    def paused(self) -> bool:
+        return self.sim.paused
+
+    @paused.setter
+    def paused(self, value: bool) -> None:
+        if value != self.sim.paused:
+            self.sim.paused = value
+            if self.hooks:
+                self.hooks.on_pause(value)
+
+    @property
+    def step_once(self) -> bool:
+        return self.sim.step_once
+
+    @step_once.setter
+    def step_once(self, value: bool) -> None:
+        self.sim.step_once = value
 
     def _update_caption(self) -> None:
         """Update the window caption based on game state."""
@@ -150,77 +300,145 @@ class Game:
                 caption += ' (Paused)'
         pygame.display.set_caption(caption)
 
-    def wait_if_paused(self) -> None:
-        """Wait while the game is paused."""
-        while self.paused:
-            self.handle_events()
-            self.refresh()
-
     def run(self) -> None:
-        """Run the main game loop."""
-        while True:
-            self.refresh()
-
-            # Pre-start delay: allow user to exit/pause/step before simulation begins
-            start_time = pygame.time.get_ticks()
-            while pygame.time.get_ticks() - start_time < PRE_START_DELAY_MS:
-                self.handle_events()
-                if self.step_once:  # If user pressed step, start immediately
-                    break
-                if self.paused:  # If paused, wait (user can still exit)
-                    self.refresh()
-                    continue
-                self.refresh()  # Otherwise, continue waiting and refreshing
-
-            move_iterator = enumerate(hanoi(self.settings.n_disks), 1)
-            i = 0
+        """Run the main game loop: input, one tick of the simulation, one frame."""
+        if self.state is not None:
+            self.current_move_text = 'Pick a peg with 1/2/3 or the mouse, then where to put its top disk. h for a hint.'
+        elif self.feed is not None:
+            self.current_move_text = 'Waiting for moves...'
 
+        try:
             while True:
                 self.handle_events()
+                self.update()
+                self.refresh()
+        finally:
+            if self.owns_log:
+                self.log.close()
+
+    def update(self) -> None:
+        """Advance the simulation by the last frame's time and report the moves it made."""
+        paused = self.sim.paused
+        self.sim.tick(self._dt)
+        if self.sim.paused != paused:
+            # A step ended, which pauses the run
+            if self.hooks:
+                self.hooks.on_pause(self.sim.paused)
+            self._update_caption()
+
+        # Player moves are reported when they are made, not when their animation ends
+        report = self.state is None
+        for i, (disk, from_, to) in self.sim.started:
+            if report:
+                self.current_move_text = format_move(i, disk, from_, to, self.print_spaces, self.print_disk_spaces)
+                self.log.print(self.current_move_text)
+        for i, (disk, from_, to) in self.sim.landed:
+            if self.array_view is not None:
+                self.array_view.move(disk, from_, to)
+            if report and self.hooks:
+                self.hooks.on_move(i, disk, from_, to)
+        if report and self.array_view is not None and self.sim.landed:
+            # At thousands of moves per second printing would dominate the frame time, only show the last
+            i, (disk, from_, to) = self.sim.landed[-1]
+            self.current_move_text = format_move(i, disk, from_, to, self.print_spaces, self.print_disk_spaces)
+
+        if self.sim.finished and not self.finished:
+            self._finish()
+
+    def _finish(self) -> None:
+        """Show how the run ended."""
+        self.finished = True
+        i = self.sim.moves_made
+        style = 'green'
+        if self.feed is not None and self.feed.error is not None:
+            style = 'red'
+            text = f'Stream stopped after {i} moves: {self.feed.error}'
+        else:
+            if self.hooks:
+                self.hooks.on_finish(i)
+            if self.feed is not None and not self.feed.solved:
+                text = f'Stream ended after {i} moves.'
+            else:
+                suffix = 's' if self.settings.n_disks > 1 else ''
+                text = f'{self.settings.n_disks} disk{suffix} solved in {i} move{suffix}.'
+        self.log.print(f'\n[{style}]{text}')
+        self.current_move_text = text
+        self._update_caption()
 
-                # If paused, wait (unless step_once is triggered, which will unpause)
-                if self.paused and not self.step_once:
-                    self.refresh()
-                    continue
-
-                # Execute next move
-                try:
-                    i, (disk, from_, to) = next(move_iterator)
-                    move_text = (
-                        f'{i:{self.print_spaces}}: Move disk {disk:{self.print_disk_spaces}} from peg {from_} to {to}.'
-                    )
-                    console.print(move_text)
-                    self.current_move_text = move_text
-                    self.move_disk(i, from_, to)
-
-                    # If in step mode, pause after completing the move
-                    if self.step_once:
-                        self._update_caption()
-                        self.paused = True
-                        self.step_once = False
-                except StopIteration:
-                    self.finished = True
-                    suffix = 's' if self.settings.n_disks > 1 else ''
-                    completion_text = f'{self.settings.n_disks} disk{suffix} solved in {i} move{suffix}.'
-                    console.print(f'\n[green]{completion_text}')
-                    self.current_move_text = completion_text
-                    self._update_caption()
-                    while True:  # Wait for restart or quit
-                        self.handle_events()
-                        self.refresh()
+    def select_peg(self, peg: int) -> None:
+        """First selection picks the peg to take from, the second the peg to drop on."""
+        if self.finished:
+            return
+        if self.selected_peg is None:
+            if self.state.top(peg):
+                self.selected_peg = peg
+            else:
+                self.current_move_text = f'Peg {peg} is empty.'
+        elif self.selected_peg == peg:
+            self.selected_peg = None
+        else:
+            from_, self.selected_peg = self.selected_peg, None
+            self.player_move(from_, peg)
+
+    def show_hint(self) -> None:
+        if self.finished:
+            return
+        disk, from_, to = self.state.next_move()
+        self.current_move_text = f'Hint: move disk {disk} from peg {from_} to {to}.'
+
+    def player_move(self, from_: int, to: int) -> None:
+        """Make a move for the player if it is legal, and queue it to be animated."""
+        try:
+            disk = self.state.move(from_, to)
+        except IllegalMove as e:
+            self.current_move_text = f'Illegal move: {e}.'
+            return
+
+        self.player_moves += 1
+        self.distance = self.state.distance()
+        self.current_move_text = format_move(
+            self.player_moves, disk, from_, to, self.print_spaces, self.print_disk_spaces
+        ).lstrip()
+        # The progress bar shows how close the board is to solved
+        self.player_queue.append((self.total_moves - self.distance, (disk, from_, to)))
+        if self.hooks:
+            self.hooks.on_move(self.player_moves, disk, from_, to)
+
+        if self.distance == 0:
+            self.finished = True
+            self.current_move_text = f'Solved in {self.player_moves} moves, the optimum is {self.total_moves}.'
+            self.log.print(f'[green]{self.current_move_text}')
+            self._update_caption()
+            if self.hooks:
+                self.hooks.on_finish(self.player_moves)
+
+    def _peg_at(self, x: int) -> int:
+        """The peg closest to screen position ``x``."""
+        return min(range(3), key=lambda k: abs(self.pegs[k].centerx - x)) + 1
 
     def refresh(self) -> None:
-        """Refresh the game display."""
+        """Draw the simulation and end the frame."""
         self.screen.fill(Color.WHITE)
         pygame.draw.rect(self.screen, Color.BLACK, self.board)
 
+        self.progress_bar.width = round(self.sim.progress * self.progress_border.width)
         pygame.draw.rect(self.screen, Color.BLACK, self.progress_border, 2)
         pygame.draw.rect(self.screen, Color.GREEN, self.progress_bar)
 
-        for peg in self.pegs:
-            pygame.draw.rect(self.screen, Color.BLACK, peg)
-        for i, disk in enumerate(self.disks):
-            pygame.draw.rect(self.screen, Color.DISK_COLORS[i % len(Color.DISK_COLORS)], disk)
+        if self.array_view is not None:
+            self.array_view.draw(self.screen)
+        else:
+            for peg in self.pegs:
+                pygame.draw.rect(self.screen, Color.BLACK, peg)
+            for i, disk in enumerate(self.disks):
+                x, bottom = self.sim.positions[i]
+                disk.centerx, disk.bottom = round(x), round(bottom)
+                pygame.draw.rect(self.screen, self.disk_colors[i % len(self.disk_colors)], disk)
+
+        if self.state is not None:
+            self._render_play_status()
+        if self.feed is not None:
+            self._render_follow_status()
 
         help_surface = self.font.render('?', True, Color.GREY)
         help_rect = help_surface.get_rect(centerx=WIDTH - 20, centery=20)
@@ -237,51 +455,28 @@ class Game:
             self._render_help()
 
         pygame.display.flip()
-        self.clock.tick(FPS)
-
-    def _step_towards(
-        self,
-        rect: pygame.Rect,
-        *,
-        x: int | None = None,
-        y: int | None = None,
-        bottom: int | None = None,
-    ) -> bool:
-        """Move a rect one step towards the target position. Returns True if reached."""
-        speed = self.settings.speed
-
-        def approach(current: int, target: int) -> tuple[int, bool]:
-            if current == target or abs(target - current) <= speed:
-                return target, True
-            return (current + speed if target > current else current - speed), False
-
-        done = True
-        if x is not None:
-            rect.centerx, ok = approach(rect.centerx, x)
-            done &= ok
-        if y is not None:
-            rect.centery, ok = approach(rect.centery, y)
-            done &= ok
-        if bottom is not None:
-            rect.bottom, ok = approach(rect.bottom, bottom)
-            done &= ok
-        return done
-
-    def _animate_to(
-        self,
-        rect: pygame.Rect,
-        *,
-        x: int | None = None,
-        y: int | None = None,
-        bottom: int | None = None,
-    ) -> None:
-        """Animate a rect to a target position."""
-        done = False
-        while not done:
-            self.handle_events()
-            self.wait_if_paused()
-            done = self._step_towards(rect, x=x, y=y, bottom=bottom)
-            self.refresh()
+        ms = self.events.tick()
+        # Recordings and replays run on a fixed clock so they animate the same every time
+        self._dt = 1 / FPS if self.events.fixed_timestep else min(ms / 1000, MAX_FRAME_SECONDS)
+        if self.hooks:
+            now = time.perf_counter()
+            self.hooks.on_frame(now - self._last_frame)
+            self._last_frame = now
+
+    def _render_play_status(self) -> None:
+        if self.selected_peg is not None:
+            marker = pygame.Rect(0, 0, 40, 6)
+            marker.midbottom = (self.pegs[self.selected_peg - 1].centerx, PEG_HEIGHT - 6)
+            pygame.draw.rect(self.screen, Color.LIGHT_BLUE, marker)
+
+        status = f'Moves: {self.player_moves}    Distance to goal: {self.distance}'
+        status_surface = self.font.render(status, True, Color.GREY)
+        self.screen.blit(status_surface, status_surface.get_rect(left=20, centery=20))
+
+    def _render_follow_status(self) -> None:
+        status = f'Moves: {self.sim.moves_made}    Queued: {self.feed.depth}/{self.feed.maxsize}'
+        status_surface = self.font.render(status, True, Color.GREY)
+        self.screen.blit(status_surface, status_surface.get_rect(left=20, centery=20))
 
     def _render_help(self) -> None:
         # Create a semi-transparent overlay surface
@@ -295,8 +490,18 @@ class Game:
             ('?', 'Show/hide help'),
             ('esc / q', 'Quit game'),
             ('r', 'Return to start screen'),
-            ('space / p', 'Pause/unpause'),
-            ('right / n', 'Step once'),
+        ]
+        if self.state is not None:
+            keybindings += [
+                ('1 / 2 / 3', 'Pick a peg / drop on it'),
+                ('h', 'Hint the best next move'),
+            ]
+        else:
+            keybindings += [
+                ('space / p', 'Pause/unpause'),
+                ('right / n', 'Step once'),
+            ]
+        keybindings += [
             ('f', 'Increase speed'),
             ('s', 'Decrease speed'),
         ]
@@ -339,28 +544,22 @@ class Game:
         close_rect = close_text.get_rect(center=(WIDTH // 2, box_y + box_height - 25))
         self.screen.blit(close_text, close_rect)
 
-    def move_disk(self, step: int, from_peg: int, to_peg: int) -> None:
-        """Move a disk from one peg to another."""
-        disk = self.peg_stacks[from_peg].pop()
-
-        final_width = self._calculate_progress(step)
-        step_size = (final_width - self.progress_bar.width) // 3
-
-        # raise disk
-        self._animate_to(disk, y=LIFT_Y)
-        self.progress_bar.width += step_size
-
-        # move disk to next peg
-        to_x = self.pegs[to_peg - 1].centerx
-        self._animate_to(disk, x=to_x)
-        self.progress_bar.width += step_size
-
-        to_y = self.peg_stacks[to_peg][-1].top if self.peg_stacks[to_peg] else self.board.top
-        self._animate_to(disk, bottom=to_y)
-        self.progress_bar.width = final_width
-        self.peg_stacks[to_peg].append(disk)
 
-    def _calculate_progress(self, step: int) -> int:
-        percent_complete = step / self.total_moves
-        progress_width = round(percent_complete * self.progress_border.width)
-        return progress_width
+def _drain(moves: deque[NumberedMove]) -> Iterator[NumberedMove | None]:
+    """Moves from ``moves`` as they are queued, forever."""
+    while True:
+        yield moves.popleft() if moves else None
+
+
+def _follow(feed: MoveFeed) -> Iterator[NumberedMove | None]:
+    """Numbered moves from ``feed``, None while it has nothing ready, until the stream ends."""
+    i = 0
+    while True:
+        move = feed.get()
+        if move is not None:
+            i += 1
+            yield i, move
+        elif feed.done:
+            return
+        else:
+            yield None
@@ -2,16 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from typing import Callable
 
 import pygame
 
-from hanoi.cli import Settings
+from hanoi.cli import Settings, max_disks
 
 from .colors import Color
-from .constants import FPS, HEIGHT, WIDTH
+from .constants import HEIGHT, WIDTH
+from .events import EventSource
 from .exceptions import QuitGame
 
 
@@ -50,17 +51,19 @@ class InputField:
 class StartScreen:
     """Start screen for configuring game parameters before starting."""
 
-    def __init__(self, screen: pygame.Surface, default_settings: Settings):
+    def __init__(self, screen: pygame.Surface, default_settings: Settings, events: EventSource | None = None):
         self.screen = screen
         self.default_settings = default_settings
+        self.events = events if events is not None else EventSource()
 
         # Define input fields
+        limit = max_disks(default_settings.view, default_settings.variant)
         self.fields: dict[FieldType, InputField] = {
             FieldType.N_DISKS: InputField(
                 field_type=FieldType.N_DISKS,
-                label='Number of Disks (1-15):',
+                label=f'Number of Disks (1-{limit}):',
                 value=default_settings.n_disks,
-                validator=lambda x: max(1, min(x, 15)),
+                validator=lambda x: max(1, min(x, limit)),
             ),
             FieldType.SPEED: InputField(
                 field_type=FieldType.SPEED,
@@ -170,7 +173,8 @@ class StartScreen:
         # Commit any field that's being edited
         if self.editing and self.active_field in self.fields:
             self._commit_field()
-        return Settings(
+        return replace(
+            self.default_settings,
             n_disks=self.fields[FieldType.N_DISKS].value,
             speed=self.fields[FieldType.SPEED].value,
             animate=True,
@@ -264,10 +268,8 @@ class StartScreen:
 
     def run(self) -> Settings:
         """Run the start screen loop. Returns Settings when user starts the game."""
-        clock = pygame.time.Clock()
-
         while True:
-            for event in pygame.event.get():
+            for event in self.events.get():
                 if event.type == pygame.QUIT:
                     raise QuitGame
 
@@ -276,4 +278,4 @@ class StartScreen:
                     return settings
 
             self.render()
-            clock.tick(FPS)
+            self.events.tick()
@@ -0,0 +1,213 @@
+"""Observer hooks for the solver and the game, and sinks that export metrics from them."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+
+from hanoi.solver import Move
+
+
+class Observer:
+    """Base class for hooks. Override only the callbacks you need.
+
+    Callbacks that are not overridden are never called, so an observer that
+    only cares about ``on_finish`` adds nothing to the per-move cost.
+    """
+
+    def on_move(self, i: int, disk: int, from_: int, to: int) -> None:
+        """Called after move ``i`` (1-based) is made."""
+
+    def on_frame(self, seconds: float) -> None:
+        """Called once per rendered frame with the wall time since the previous frame."""
+
+    def on_pause(self, paused: bool) -> None:
+        """Called when the game is paused or resumed."""
+
+    def on_finish(self, moves: int) -> None:
+        """Called when the puzzle is solved."""
+
+    def close(self) -> None:
+        """Called once when the run ends, solved or not."""
+
+
+CALLBACKS = ('on_move', 'on_frame', 'on_pause', 'on_finish', 'close')
+
+
+class Hooks:
+    """Fans callbacks out to registered observers.
+
+    A ``Hooks`` with no observers is falsy; call sites check it before doing any
+    per-move work, so an unobserved run costs nothing.
+    """
+
+    def __init__(self, *observers: Observer):
+        self.observers: list[Observer] = []
+        self._callbacks: dict[str, list] = {name: [] for name in CALLBACKS}
+        for observer in observers:
+            self.register(observer)
+
+    def register(self, observer: Observer) -> None:
+        self.observers.append(observer)
+        for name in CALLBACKS:
+            if getattr(type(observer), name) is not getattr(Observer, name):
+                self._callbacks[name].append(getattr(observer, name))
+
+    def __bool__(self) -> bool:
+        return bool(self.observers)
+
+    def on_move(self, i: int, disk: int, from_: int, to: int) -> None:
+        for callback in self._callbacks['on_move']:
+            callback(i, disk, from_, to)
+
+    def on_frame(self, seconds: float) -> None:
+        for callback in self._callbacks['on_frame']:
+            callback(seconds)
+
+    def on_pause(self, paused: bool) -> None:
+        for callback in self._callbacks['on_pause']:
+            callback(paused)
+
+    def on_finish(self, moves: int) -> None:
+        for callback in self._callbacks['on_finish']:
+            callback(moves)
+
+    def close(self) -> None:
+        for callback in self._callbacks['close']:
+            callback()
+
+
+def observe(moves: Iterable[Move], hooks: Hooks | None, first: int = 1) -> Iterator[Move]:
+    """Wrap a move stream so ``hooks`` see every move and the finish.
+
+    ``first`` is the index of the first move, for streams that resume part way.
+    Returns the stream itself when there is nothing to notify.
+    """
+    if not hooks:
+        return iter(moves)
+
+    def _observe() -> Iterator[Move]:
+        i = first - 1
+        for i, move in enumerate(moves, first):
+            yield move
+            hooks.on_move(i, *move)
+        hooks.on_finish(i)
+
+    return _observe()
+
+
+class MetricsSink(Observer, ABC):
+    """Collects move, frame and pause counters and periodically writes them out.
+
+    Subclasses decide the output format in ``write``. Files are flushed at most
+    every ``interval`` seconds while running, and always on finish and close.
+    """
+
+    # Only look at the clock every this many moves to keep on_move cheap
+    CHECK_EVERY = 1024
+
+    def __init__(self, path: str | os.PathLike, interval: float = 1.0):
+        self.path = os.fspath(path)
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_flush = self.started
+        self.moves = 0
+        self.frames = 0
+        self.frame_seconds = 0.0
+        self.frame_seconds_max = 0.0
+        self.paused_seconds = 0.0
+        self.paused_since: float | None = None
+        self.finished = False
+
+    def on_move(self, i: int, disk: int, from_: int, to: int) -> None:
+        self.moves = i
+        if i % self.CHECK_EVERY == 0:
+            self._maybe_flush()
+
+    def on_frame(self, seconds: float) -> None:
+        self.frames += 1
+        self.frame_seconds += seconds
+        self.frame_seconds_max = max(self.frame_seconds_max, seconds)
+        self._maybe_flush()
+
+    def on_pause(self, paused: bool) -> None:
+        now = time.perf_counter()
+        if paused and self.paused_since is None:
+            self.paused_since = now
+        elif not paused and self.paused_since is not None:
+            self.paused_seconds += now - self.paused_since
+            self.paused_since = None
+
+    def on_finish(self, moves: int) -> None:
+        self.moves = moves
+        self.finished = True
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def snapshot(self) -> dict[str, float]:
+        now = time.perf_counter()
+        elapsed = now - self.started
+        paused = self.paused_seconds + (now - self.paused_since if self.paused_since is not None else 0.0)
+        running = elapsed - paused
+        return {
+            'moves_total': self.moves,
+            'moves_per_second': self.moves / running if running > 0 else 0.0,
+            'frames_total': self.frames,
+            'frame_seconds_sum': self.frame_seconds,
+            'frame_seconds_max': self.frame_seconds_max,
+            'paused_seconds_total': paused,
+            'elapsed_seconds': elapsed,
+            'finished': int(self.finished),
+        }
+
+    def flush(self) -> None:
+        self.last_flush = time.perf_counter()
+        self.write(self.snapshot())
+
+    @abstractmethod
+    def write(self, snapshot: dict[str, float]) -> None: ...
+
+    def _maybe_flush(self) -> None:
+        if time.perf_counter() - self.last_flush >= self.interval:
+            self.flush()
+
+
+class PrometheusTextfileSink(MetricsSink):
+    """Writes metrics in the Prometheus text format, for node_exporter's textfile collector.
+
+    The file is replaced atomically so the collector never reads a partial write.
+    """
+
+    PREFIX = 'hanoi_'
+
+    def write(self, snapshot: dict[str, float]) -> None:
+        lines = []
+        for name, value in snapshot.items():
+            metric = self.PREFIX + name
+            kind = 'counter' if name.endswith('_total') else 'gauge'
+            lines.append(f'# TYPE {metric} {kind}')
+            lines.append(f'{metric} {value}')
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, self.path)
+
+
+class JsonlSink(MetricsSink):
+    """Appends one JSON object per flush, with a wall clock timestamp."""
+
+    def write(self, snapshot: dict[str, float]) -> None:
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'time': time.time(), **snapshot}) + '\n')
+
+
+def metrics_sink(path: str | os.PathLike) -> MetricsSink:
+    """Pick a sink from the file extension: ``.prom`` for Prometheus, JSON lines otherwise."""
+    if os.fspath(path).endswith('.prom'):
+        return PrometheusTextfileSink(path)
+    return JsonlSink(path)
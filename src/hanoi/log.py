@@ -0,0 +1,117 @@
+"""Console output written from a background thread, so a slow terminal never holds up a frame."""
+
+from __future__ import annotations
+
+import contextlib
+import queue
+import threading
+
+from rich.console import Console
+
+LOG_POLICIES = ('coalesce', 'drop')
+LOG_QUEUE_SIZE = 256
+
+# How often the writer checks for held back lines when it has nothing queued, in seconds
+POLL_SECONDS = 0.05
+
+_STOP = object()
+
+
+class BackgroundLog:
+    """Prints to ``console`` on a daemon thread fed by a bounded queue.
+
+    ``print`` never waits. When the queue is full the line is held back: with
+    the ``coalesce`` policy the newest line is kept and the ones before it are
+    counted, with ``drop`` every line is counted and lost. Either way nothing
+    more is queued until the writer has caught up and printed how many lines
+    were skipped, so the output stays in order. ``quiet`` prints nothing.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        policy: str = 'coalesce',
+        maxsize: int = LOG_QUEUE_SIZE,
+        quiet: bool = False,
+    ):
+        if policy not in LOG_POLICIES:
+            raise ValueError(f'unknown log policy {policy!r}, expected one of {LOG_POLICIES}')
+        self.console = console
+        self.policy = policy
+        self.quiet = quiet
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        # Lines not printed since the writer last caught up, and for coalesce the newest of them
+        self.skipped = 0
+        self.held: str | None = None
+        # Total over the whole run
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        if not quiet:
+            self._thread = threading.Thread(target=self._write, daemon=True)
+            self._thread.start()
+
+    def print(self, text: str) -> None:
+        """Queue ``text``, in rich markup, to be printed."""
+        if self.quiet:
+            return
+        with self._lock:
+            if self.skipped or self.held is not None:
+                self._hold(text)
+                return
+            try:
+                self.queue.put_nowait(text)
+            except queue.Full:
+                self._hold(text)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Print what is still queued and stop the writer, waiting at most ``timeout`` seconds."""
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _hold(self, text: str) -> None:
+        if self.policy == 'coalesce':
+            if self.held is not None:
+                self.skipped += 1
+                self.dropped += 1
+            self.held = text
+        else:
+            self.skipped += 1
+            self.dropped += 1
+
+    def _catch_up(self) -> list[str]:
+        """Take the skipped count and the held line, once everything queued before them is printed."""
+        with self._lock:
+            # Checked under the lock, print() cannot queue a line in between
+            if not self.queue.empty():
+                return []
+            lines = []
+            if self.skipped:
+                verb = 'skipped' if self.policy == 'coalesce' else 'dropped'
+                lines.append(f'[dim]... {self.skipped} line{"s" if self.skipped > 1 else ""} {verb}[/]')
+            if self.held is not None:
+                lines.append(self.held)
+            self.skipped = 0
+            self.held = None
+            return lines
+
+    def _write(self) -> None:
+        while True:
+            try:
+                item = self.queue.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                item = None
+            lines = [] if item is None or item is _STOP else [item]
+            lines += self._catch_up()
+            for line in lines:
+                # A closed pipe: keep draining so the game never waits on it
+                with contextlib.suppress(OSError):
+                    self.console.print(line)
+            if item is _STOP:
+                return
@@ -0,0 +1,187 @@
+"""Display independent model of the animation, advanced with ``tick(dt)`` and drawn by a renderer."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Tuple
+
+from hanoi.solver import Move
+
+# A move with the progress it brings once it lands, usually its move number
+NumberedMove = Tuple[int, Move]
+
+# Phases of an animated move: up off the source peg, across, down onto the target
+LIFT, SHIFT, DROP = range(3)
+
+# Budget left over from float rounding, too small to move anything
+EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Where the animation happens, in pixels with y growing downwards."""
+
+    peg_x: tuple[int, int, int]
+    # Bottom of the lowest disk on a peg
+    base_y: int
+    # Bottom of a disk carried between pegs
+    lift_y: int
+    disk_height: int
+
+    def stack_y(self, level: int) -> int:
+        """Bottom of the disk at ``level`` of a stack, 0 being the lowest."""
+        return self.base_y - level * self.disk_height
+
+
+@dataclass
+class Flight:
+    """The move being animated and how far along it is."""
+
+    i: int
+    move: Move
+    index: int
+    phase: int = LIFT
+
+
+class Simulation:
+    """Disk positions, the move in flight, and the pause, step and progress state of a run.
+
+    Moves are pulled from ``moves``, an iterator of ``(i, (disk, from, to))``
+    where ``i`` is the progress once the move lands, usually its number. A
+    source that has nothing ready yet yields None, and the run is finished once
+    it is exhausted. Disks are identified by their index in the starting tower,
+    0 at the bottom, so towers with equal sizes work too.
+
+    Each ``tick(dt)`` moves disks ``speed * dt`` pixels, carrying what is left
+    of the distance from one phase and move into the next. With ``instant``,
+    up to ``moves_per_tick`` moves land on every tick instead. The moves that
+    started and landed during the last tick are left in ``started`` and ``landed``
+    for the renderer, which never has to touch the model otherwise.
+    """
+
+    def __init__(
+        self,
+        layout: Layout,
+        stacks: dict[int, list[int]],
+        moves: Iterator[NumberedMove | None],
+        *,
+        total_moves: int,
+        speed: float,
+        first_move: int = 0,
+        delay: float = 0.0,
+        instant: bool = False,
+        moves_per_tick: int = 1,
+    ):
+        self.layout = layout
+        self.stacks = {peg: list(stacks.get(peg, [])) for peg in (1, 2, 3)}
+        self.positions: dict[int, list[float]] = {}
+        for peg, stack in self.stacks.items():
+            for level, index in enumerate(stack):
+                self.positions[index] = [layout.peg_x[peg - 1], layout.stack_y(level)]
+        self.moves = moves
+        self.total_moves = total_moves
+        self.speed = speed
+        self.moves_made = first_move
+        self.delay = delay
+        self.instant = instant
+        self.moves_per_tick = moves_per_tick
+
+        self.flight: Flight | None = None
+        self.paused = False
+        self.step_once = False
+        self.finished = False
+        self.started: list[NumberedMove] = []
+        self.landed: list[NumberedMove] = []
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the solution done, with each phase of the move in flight counting a third of it."""
+        done = self.moves_made
+        if self.flight is not None:
+            done += (self.flight.i - self.moves_made) * self.flight.phase / 3
+        return min(done, self.total_moves) / self.total_moves
+
+    def tick(self, dt: float) -> None:
+        """Advance the run by ``dt`` seconds."""
+        self.started = []
+        self.landed = []
+        if self.finished or (self.paused and not self.step_once):
+            return
+        if self.delay > 0 and not self.step_once:
+            self.delay -= dt
+            return
+        self.delay = 0.0
+
+        if self.instant:
+            self._land_instantly()
+            return
+
+        budget = self.speed * dt
+        while budget > EPSILON:
+            if self.flight is None and not self._take_off():
+                break
+            budget = self._fly(budget)
+            if self.flight is None and self.step_once:
+                self._end_step()
+                break
+
+    def _next(self) -> NumberedMove | None:
+        try:
+            return next(self.moves)
+        except StopIteration:
+            self.finished = True
+            return None
+
+    def _take_off(self) -> bool:
+        item = self._next()
+        if item is None:
+            return False
+        i, (disk, from_, to) = item
+        self.flight = Flight(i, (disk, from_, to), self.stacks[from_].pop())
+        self.started.append(item)
+        return True
+
+    def _fly(self, budget: float) -> float:
+        """Move the disk in flight by up to ``budget`` pixels. Returns what is left of the budget."""
+        flight = self.flight
+        to = flight.move[2]
+        position = self.positions[flight.index]
+        if flight.phase == SHIFT:
+            axis, target = 0, self.layout.peg_x[to - 1]
+        elif flight.phase == LIFT:
+            axis, target = 1, self.layout.lift_y
+        else:
+            axis, target = 1, self.layout.stack_y(len(self.stacks[to]))
+
+        remaining = abs(target - position[axis])
+        if remaining > budget:
+            position[axis] += budget if target > position[axis] else -budget
+            return 0.0
+        position[axis] = target
+        flight.phase += 1
+        if flight.phase > DROP:
+            self._land(flight.i, flight.move, flight.index)
+            self.flight = None
+        return budget - remaining
+
+    def _land_instantly(self) -> None:
+        for _ in range(1 if self.step_once else self.moves_per_tick):
+            item = self._next()
+            if item is None:
+                break
+            i, (disk, from_, to) = item
+            self._land(i, (disk, from_, to), self.stacks[from_].pop())
+        if self.landed and self.step_once:
+            self._end_step()
+
+    def _land(self, i: int, move: Move, index: int) -> None:
+        to = move[2]
+        self.positions[index] = [self.layout.peg_x[to - 1], self.layout.stack_y(len(self.stacks[to]))]
+        self.stacks[to].append(index)
+        self.moves_made = i
+        self.landed.append((i, move))
+
+    def _end_step(self) -> None:
+        self.step_once = False
+        self.paused = True
@@ -2,33 +2,265 @@ from __future__ import annotations
 
 import time
 from collections.abc import Iterator
-from typing import Tuple
+from dataclasses import dataclass
+from typing import Callable, Tuple
 
 Move = Tuple[int, int, int]
 
+PEGS = (1, 2, 3)
 
-def hanoi(disks: int) -> Iterator[Move]:
+
+def check_pegs(start: int, target: int) -> None:
+    """Raise ValueError unless start and target are two different pegs."""
+    if start not in PEGS or target not in PEGS:
+        raise ValueError(f'pegs must be one of {PEGS}, got {start} and {target}')
+    if start == target:
+        raise ValueError(f'start and target pegs must differ, got {start} for both')
+
+
+def hanoi(disks: int, start: int = 1, target: int = 3) -> Iterator[Move]:
+    check_pegs(start, target)
+    if disks < 1:
+        return iter(())
+    return _classic(disks, start, target)
+
+
+def hanoi_from(disks: int, index: int, start: int = 1, target: int = 3) -> Iterator[Move]:
+    """The classic solution with its first ``index`` moves skipped, without generating them."""
+    check_pegs(start, target)
+    if not 0 <= index < 1 << max(disks, 0):
+        raise ValueError(f'move index must be between 0 and {(1 << max(disks, 0)) - 1}, got {index}')
     if disks < 1:
         return iter(())
+    return _classic(disks, start, target, index + 1)
+
+
+def _classic(disks: int, start: int, target: int, first: int = 1) -> Iterator[Move]:
+    # Move m (1-based) moves the disk given by its lowest set bit, for the k-th time.
+    # Disk d always cycles through the pegs the same way: start -> target -> spare
+    # when n - d is even, start -> spare -> target when it is odd.
+    spare = 6 - start - target
+    cycles = ((start, target, spare), (start, spare, target))
+    for m in range(first, 1 << disks):
+        disk = (m & -m).bit_length()
+        cycle = cycles[(disks - disk) & 1]
+        k = (m >> disk) % 3
+        yield disk, cycle[k], cycle[(k + 1) % 3]
+
+
+@dataclass(frozen=True)
+class Solver:
+    """A registered engine for one variant of the puzzle."""
+
+    name: str
+    description: str
+    moves: Callable[[int, int, int], Iterator[Move]]
+    count: Callable[[int, int, int], int]
+    tower: Callable[[int], list[int]]
+
+
+SOLVERS: dict[str, Solver] = {}
+
+
+def _distinct_tower(disks: int) -> list[int]:
+    return list(range(disks, 0, -1))
+
+
+def register_solver(
+    name: str,
+    description: str,
+    count: Callable[[int, int, int], int],
+    tower: Callable[[int], list[int]] = _distinct_tower,
+) -> Callable:
+    """Register a move generator ``f(disks, start, target)`` under ``name``.
+
+    ``count`` gives the length of its solution in closed form and ``tower`` the
+    disk sizes of the starting stack from the bottom up.
+    """
+
+    def decorator(moves: Callable[[int, int, int], Iterator[Move]]) -> Callable[[int, int, int], Iterator[Move]]:
+        if name in SOLVERS:
+            raise ValueError(f'a solver named {name!r} is already registered')
+
+        def checked(disks: int, start: int = 1, target: int = 3) -> Iterator[Move]:
+            check_pegs(start, target)
+            if disks < 1:
+                return iter(())
+            return moves(disks, start, target)
+
+        SOLVERS[name] = Solver(name, description, checked, count, tower)
+        return moves
+
+    return decorator
+
+
+def get_solver(name: str) -> Solver:
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f'unknown variant {name!r}, expected one of {", ".join(SOLVERS)}') from None
+
+
+def _run(tasks: list, expand: Callable[[tuple], list | None]) -> Iterator[Move]:
+    """Drive a divide and conquer solution with an explicit stack instead of recursion.
 
-    def _hanoi(disk: int, from_: int, to: int, via: int) -> Iterator[Move]:
-        if disk == 1:
-            yield disk, from_, to
+    ``tasks`` holds pending work, last item first. ``expand`` turns a task into
+    its subtasks (in order) or returns None when the task is a single move.
+    """
+    while tasks:
+        task = tasks.pop()
+        subtasks = expand(task)
+        if subtasks is None:
+            yield task[1:]
         else:
-            yield from _hanoi(disk - 1, from_, via, to)
-            yield disk, from_, to
-            yield from _hanoi(disk - 1, via, to, from_)
+            tasks.extend(reversed(subtasks))
 
-    return _hanoi(disks, 1, 3, 2)
 
+def _classic_count(disks: int, start: int = 1, target: int = 3) -> int:
+    return (1 << disks) - 1
 
-if __name__ == '__main__':
-    disks = 9
-    start = time.perf_counter()
 
-    for i, (disk, from_, to) in enumerate(hanoi(disks), 1):
-        print(f'{i:,}: Move disk {disk} from peg {from_} to {to}.')
+register_solver('classic', 'the original puzzle, any disk to any peg', _classic_count)(_classic)
+
+
+def _cyclic_count(disks: int, start: int = 1, target: int = 3) -> int:
+    # With (1 + sqrt 3)^k = x_k + y_k sqrt 3, a clockwise transfer takes y_{n+1} - 1
+    # moves and a counterclockwise one y_{n+2} / 2 - 1.
+    k = disks + 1 if target == start % 3 + 1 else disks + 2
+    x, y = 1, 0
+    base_x, base_y = 1, 1
+    while k:
+        if k & 1:
+            x, y = x * base_x + 3 * y * base_y, x * base_y + y * base_x
+        base_x, base_y = base_x * base_x + 3 * base_y * base_y, 2 * base_x * base_y
+        k >>= 1
+    return y - 1 if target == start % 3 + 1 else y // 2 - 1
+
+
+@register_solver('cyclic', 'disks only move clockwise, 1 -> 2 -> 3 -> 1', _cyclic_count)
+def _cyclic(disks: int, start: int, target: int) -> Iterator[Move]:
+    def clockwise(peg: int) -> int:
+        return peg % 3 + 1
+
+    def expand(task: tuple) -> list | None:
+        kind, n, a, b = task
+        if kind == 'move':
+            return None
+        if n == 0:
+            return []
+        c = 6 - a - b
+        if clockwise(a) == b:
+            # One step: the smaller disks go the long way round to c and back
+            return [('transfer', n - 1, a, c), ('move', n, a, b), ('transfer', n - 1, c, b)]
+        # Two steps: the disk stops on c on its way from a to b
+        return [
+            ('transfer', n - 1, a, b),
+            ('move', n, a, c),
+            ('transfer', n - 1, b, a),
+            ('move', n, c, b),
+            ('transfer', n - 1, a, b),
+        ]
+
+    return _run([('transfer', disks, start, target)], expand)
+
+
+def _adjacent_count(disks: int, start: int = 1, target: int = 3) -> int:
+    return 3**disks - 1 if {start, target} == {1, 3} else (3**disks - 1) // 2
+
+
+@register_solver('adjacent', 'disks only move between neighbouring pegs, never 1 <-> 3', _adjacent_count)
+def _adjacent(disks: int, start: int, target: int) -> Iterator[Move]:
+    def expand(task: tuple) -> list | None:
+        kind, n, a, b = task
+        if kind == 'move':
+            return None
+        if n == 0:
+            return []
+        c = 6 - a - b
+        if {a, b} == {1, 3}:
+            # End to end: the disk steps through the middle peg twice
+            return [
+                ('transfer', n - 1, a, b),
+                ('move', n, a, 2),
+                ('transfer', n - 1, b, a),
+                ('move', n, 2, b),
+                ('transfer', n - 1, a, b),
+            ]
+        return [('transfer', n - 1, a, c), ('move', n, a, b), ('transfer', n - 1, c, b)]
+
+    return _run([('transfer', disks, start, target)], expand)
+
 
-    end = time.perf_counter()
+def _bicolor_tower(disks: int) -> list[int]:
+    return [size for size in range(disks, 0, -1) for _ in range(2)]
+
+
+def _bicolor_count(disks: int, start: int = 1, target: int = 3) -> int:
+    return (1 << (disks + 2)) - 5
+
+
+@register_solver(
+    'bicolor',
+    'two disks of each size in alternating colors, which must keep their order',
+    _bicolor_count,
+    _bicolor_tower,
+)
+def _bicolor(disks: int, start: int, target: int) -> Iterator[Move]:
+    # 'swap' moves the pairs without caring about colors, which reverses every pair.
+    # Doing it twice restores the order, which is what 'keep' relies on.
+    def expand(task: tuple) -> list | None:
+        kind, n, a, b = task
+        if kind == 'move':
+            return None
+        if n == 0:
+            return []
+        c = 6 - a - b
+        if kind == 'swap':
+            return [('swap', n - 1, a, c), ('move', n, a, b), ('move', n, a, b), ('swap', n - 1, c, b)]
+        if n == 1:
+            return [('move', 1, a, c), ('move', 1, a, b), ('move', 1, c, b)]
+        return [
+            ('swap', n - 1, a, b),
+            ('move', n, a, c),
+            ('move', n, a, c),
+            ('swap', n - 1, b, a),
+            ('move', n, c, b),
+            ('move', n, c, b),
+            ('keep', n - 1, a, b),
+        ]
+
+    return _run([('keep', disks, start, target)], expand)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    solver: str
+    disks: int
+    moves: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Moves per second."""
+        return self.moves / self.seconds if self.seconds > 0 else float('inf')
+
+
+def benchmark(disks: int, names: list[str] | None = None) -> list[BenchmarkResult]:
+    """Time a full solution of ``disks`` disks with each registered solver."""
+    results = []
+    for name in names or list(SOLVERS):
+        solver = get_solver(name)
+        start = time.perf_counter()
+        moves = sum(1 for _ in solver.moves(disks, 1, 3))
+        results.append(BenchmarkResult(name, disks, moves, time.perf_counter() - start))
+    return results
+
+
+if __name__ == '__main__':
+    disks = 12
 
-    print(f'\n{disks} disks took {end - start:.2f} seconds to solve.')
+    for result in benchmark(disks):
+        print(
+            f'{result.solver:>10}: {result.disks} disks, {result.moves:>10,} moves '
+            f'in {result.seconds:6.2f} seconds ({result.throughput:,.0f} moves/s)'
+        )
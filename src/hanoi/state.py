@@ -0,0 +1,194 @@
+"""Bitmask board representation with constant time move checks and optimal hints."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from hanoi.solver import PEGS, Move
+
+
+class IllegalMove(ValueError):
+    """Raised when a move breaks the rules of the puzzle."""
+
+
+class Board:
+    """The contents of the three pegs as bitmasks.
+
+    Bit ``d - 1`` of ``masks[p]`` is set when disk ``d`` is on peg ``p``, so the
+    top disk of a peg is its lowest set bit and a move can be checked with a
+    couple of integer operations regardless of the number of disks.
+    """
+
+    __slots__ = ('masks', 'n')
+
+    def __init__(self, n: int, masks: Mapping[int, int]):
+        self.n = n
+        # Index 0 is unused so pegs index directly
+        self.masks = [0, masks.get(1, 0), masks.get(2, 0), masks.get(3, 0)]
+        full = (1 << n) - 1
+        # The masks cover every disk once exactly when their union and their sum are both full
+        if self.masks[1] | self.masks[2] | self.masks[3] != full or sum(self.masks) != full:
+            raise ValueError(f'pegs must hold each of the {n} disks exactly once')
+
+    @classmethod
+    def initial(cls, n: int, peg: int = 1) -> Board:
+        """All ``n`` disks stacked on ``peg``."""
+        return cls(n, {peg: (1 << n) - 1})
+
+    @classmethod
+    def from_stacks(cls, n: int, stacks: Mapping[int, Sequence[int]]) -> Board:
+        """Build a board from the disks on each peg, listed bottom to top."""
+        masks = dict.fromkeys(PEGS, 0)
+        for peg, stack in stacks.items():
+            if list(stack) != sorted(stack, reverse=True):
+                raise ValueError(f'disks on peg {peg} are not in decreasing size: {list(stack)}')
+            for disk in stack:
+                masks[peg] |= 1 << (disk - 1)
+        return cls(n, masks)
+
+    @classmethod
+    def from_pegs(cls, pegs: Sequence[int]) -> Board:
+        """Build a board from the peg of each disk, smallest disk first."""
+        masks = dict.fromkeys(PEGS, 0)
+        for disk, peg in enumerate(pegs):
+            if peg not in PEGS:
+                raise ValueError(f'disk {disk + 1} is on unknown peg {peg}')
+            masks[peg] |= 1 << disk
+        return cls(len(pegs), masks)
+
+    def top(self, peg: int) -> int:
+        """The disk on top of ``peg``, or 0 when it is empty."""
+        mask = self.masks[peg]
+        return (mask & -mask).bit_length()
+
+    def peg_of(self, disk: int) -> int:
+        bit = 1 << (disk - 1)
+        for peg in PEGS:
+            if self.masks[peg] & bit:
+                return peg
+        raise ValueError(f'no disk {disk} on a board of {self.n} disks')
+
+    def pegs(self) -> list[int]:
+        """The peg of each disk, smallest disk first."""
+        return [self.peg_of(disk) for disk in range(1, self.n + 1)]
+
+    def stacks(self) -> dict[int, list[int]]:
+        """The disks on each peg, bottom to top."""
+        return {peg: [disk for disk in range(self.n, 0, -1) if self.masks[peg] >> (disk - 1) & 1] for peg in PEGS}
+
+    def is_legal(self, from_: int, to: int) -> bool:
+        source, dest = self.masks[from_], self.masks[to]
+        if not source or from_ == to:
+            return False
+        return not dest or (source & -source) < (dest & -dest)
+
+    def move(self, from_: int, to: int) -> int:
+        """Move the top disk of ``from_`` onto ``to``. Returns the disk moved."""
+        if not self.is_legal(from_, to):
+            if not self.masks[from_]:
+                raise IllegalMove(f'peg {from_} is empty')
+            if from_ == to:
+                raise IllegalMove(f'disk {self.top(from_)} is already on peg {to}')
+            raise IllegalMove(f'cannot place disk {self.top(from_)} on disk {self.top(to)}')
+        source = self.masks[from_]
+        bit = source & -source
+        self.masks[from_] ^= bit
+        self.masks[to] |= bit
+        return bit.bit_length()
+
+    def is_solved(self, target: int = 3) -> bool:
+        return self.masks[target] == (1 << self.n) - 1
+
+    def next_move(self, target: int = 3) -> Move | None:
+        """The first move of the shortest solution from this position, or None when solved.
+
+        Walks the disks from largest to smallest tracking where each one has to
+        go; the smallest disk that is not where it needs to be moves next. O(n).
+        """
+        move = None
+        for disk in range(self.n, 0, -1):
+            peg = self.peg_of(disk)
+            if peg != target:
+                move = (disk, peg, target)
+                # Everything smaller has to get out of the way first
+                target = 6 - peg - target
+        return move
+
+    def distance(self, target: int = 3) -> int:
+        """Number of moves in the shortest solution from this position. O(n)."""
+        return _distance(self.pegs(), self.n, target)
+
+    def locate(self, start: int = 1, target: int = 3) -> PathPosition:
+        """Where this position sits relative to the optimal solution from ``start`` to ``target``."""
+        return locate(self.pegs(), start, target)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Board) and self.n == other.n and self.masks == other.masks
+
+    def __repr__(self) -> str:
+        return f'Board({self.n}, {{1: {self.masks[1]:#b}, 2: {self.masks[2]:#b}, 3: {self.masks[3]:#b}}})'
+
+
+def parse_pegs(text: str) -> list[int]:
+    """Parse a board written as the peg of each disk, smallest disk first, e.g. ``'3312'``."""
+    if not text or any(char not in '123' for char in text):
+        raise ValueError(f'a board is written as one peg (1, 2 or 3) per disk, smallest first, got {text!r}')
+    return [int(char) for char in text]
+
+
+@dataclass(frozen=True)
+class PathPosition:
+    """A position relative to the optimal solution path.
+
+    ``index`` is the number of moves of the optimal solution that lead to the
+    position, or None when no prefix of it does. ``distance`` is the fewest
+    moves needed to reach some position on the path, 0 when already on it.
+    """
+
+    index: int | None
+    distance: int
+
+    @property
+    def on_path(self) -> bool:
+        return self.index is not None
+
+
+def locate(pegs: Sequence[int], start: int = 1, target: int = 3) -> PathPosition:
+    """Find a configuration on the optimal path from ``start`` to ``target``. O(n).
+
+    ``pegs`` is the peg of each disk, smallest disk first. Going from the
+    largest disk down, a disk still on its source peg has not moved yet, one on
+    its destination has moved once (after 2^(d-1) - 1 moves of the smaller disks
+    and its own), and either way the smaller disks form the same problem on the
+    remaining pegs. A disk on the spare peg never happens on the optimal path.
+    """
+    source, dest = start, target
+    index = 0
+    for disk in range(len(pegs), 0, -1):
+        peg = pegs[disk - 1]
+        spare = 6 - source - dest
+        if peg == source:
+            dest = spare
+        elif peg == dest:
+            index += 1 << (disk - 1)
+            source = spare
+        else:
+            # Off the path. The cheapest way back stacks the smaller disks on one of the
+            # other pegs, moves this disk off the spare peg, and puts the smaller disks
+            # back on the path, which costs 2^(d-1) - 1 from a full stack on the third peg.
+            gather = min(_distance(pegs, disk - 1, source), _distance(pegs, disk - 1, dest))
+            return PathPosition(index=None, distance=gather + (1 << (disk - 1)))
+    return PathPosition(index=index, distance=0)
+
+
+def _distance(pegs: Sequence[int], disks: int, target: int) -> int:
+    """Moves needed to stack the ``disks`` smallest disks on ``target``."""
+    moves = 0
+    for disk in range(disks, 0, -1):
+        peg = pegs[disk - 1]
+        if peg != target:
+            # The smaller disks go to the spare peg, this disk moves, then they follow
+            moves += 1 << (disk - 1)
+            target = 6 - peg - target
+    return moves
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pygame = pytest.importorskip('pygame')
+
+from hanoi.game.array_view import ColumnView, HeatStripView
+from hanoi.game.colors import Color
+from hanoi.solver import hanoi
+
+
+@pytest.mark.parametrize('view_cls', [ColumnView, HeatStripView])
+def test_incremental_updates_match_a_fresh_render(view_cls):
+    n = 20
+    rect = pygame.Rect(80, 100, 640, 260)
+    view = view_cls(rect, n, {1: list(range(n, 0, -1))})
+
+    moves = hanoi(n)
+    for _ in range(12345):
+        view.move(*next(moves))
+
+    fresh = view_cls(rect, n, view.stacks)
+    assert np.array_equal(view.pixels, fresh.pixels)
+
+
+def test_heat_strip_marks_the_peg_of_each_disk():
+    view = HeatStripView(pygame.Rect(0, 0, 300, 90), 3, {1: [3, 2, 1]})
+    view.move(1, 1, 3)
+
+    assert tuple(view.pixels[2, 0]) == Color.WHITE
+    assert tuple(view.pixels[2, 2]) == view.color(1)
+    assert tuple(view.pixels[0, 0]) == view.color(3)
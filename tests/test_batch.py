@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from hanoi.batch import Job, load_jobs, run_batch
+from hanoi.formats import HEADER, MAGIC, unpack_move
+from hanoi.solver import hanoi
+
+
+def test_batch_writes_every_format(tmp_path: Path):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs = [
+        {'n': 4, 'format': 'text', 'output': str(tmp_path / 'out' / '4.txt')},
+        {'n': 5, 'start': 2, 'target': 1, 'format': 'csv', 'output': str(tmp_path / 'out' / '5.csv')},
+        {'n': 6, 'start': 3, 'target': 2, 'format': 'binary', 'output': str(tmp_path / 'out' / '6.hnb')},
+        {'n': 7},
+        {'n': 4, 'variant': 'adjacent'},
+    ]
+    jobs_file.write_text('\n'.join(json.dumps(job) for job in jobs) + '\n\n')
+
+    results = run_batch(load_jobs(jobs_file), workers=2)
+
+    assert [result.moves for result in results] == [15, 31, 63, 127, 80]
+    assert len((tmp_path / 'out' / '4.txt').read_text().splitlines()) == 15
+
+    csv_lines = (tmp_path / 'out' / '5.csv').read_text().splitlines()
+    assert csv_lines[0] == 'move,disk,from,to'
+    assert csv_lines[1:] == [f'{i},{d},{f},{t}' for i, (d, f, t) in enumerate(hanoi(5, 2, 1), 1)]
+
+    data = (tmp_path / 'out' / '6.hnb').read_bytes()
+    assert HEADER.unpack_from(data) == (MAGIC, 2, 6, 3, 2, 0)
+    packed = struct.unpack_from('<63H', data, HEADER.size)
+    assert [unpack_move(p) for p in packed] == list(hanoi(6, 3, 2))
+
+
+@pytest.mark.parametrize(
+    'line',
+    [
+        '{"start": 1}',
+        '{"n": 0}',
+        '{"n": true}',
+        '{"n": 3, "start": 1.0, "format": "binary", "output": "x.hnb"}',
+        '{"n": 3, "start": true, "target": 2}',
+        '{"n": 3, "target": 3.0}',
+        '{"n": 3, "output": 5}',
+        '{"n": 256, "format": "binary", "output": "x.hnb"}',
+        '{"n": 3, "start": 2, "target": 2}',
+        '{"n": 3, "format": "xml"}',
+        '{"n": 3, "x": 1}',
+        '{"n": 3, "variant": "x"}',
+    ],
+)
+def test_invalid_jobs_report_line_number(tmp_path: Path, line: str):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs_file.write_text('{"n": 3}\n' + line + '\n')
+    with pytest.raises(ValueError, match='jobs.jsonl:2'):
+        load_jobs(jobs_file)
+
+
+def test_job_defaults():
+    assert Job.from_dict({'n': 3}) == Job(n=3, start=1, target=3, format='text', output=None)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+import struct
+from pathlib import Path
+
+import pytest
+
+from hanoi.blocks import block, chunks, verify, write_binary
+from hanoi.cli import main
+from hanoi.formats import HEADER, pack_move, write_moves
+from hanoi.solver import get_solver, hanoi
+
+
+def packed(disks: int, start: int, target: int) -> bytes:
+    moves = list(hanoi(disks, start, target))
+    return struct.pack(f'<{len(moves)}H', *(pack_move(*move) for move in moves))
+
+
+@pytest.mark.parametrize(('start', 'target'), [(1, 3), (1, 2), (2, 1), (2, 3), (3, 1), (3, 2)])
+def test_blocks_are_relabeled_solutions(start: int, target: int):
+    assert block(5, start, target) == packed(5, start, target)
+
+
+@pytest.mark.parametrize('disks', range(1, 10))
+@pytest.mark.parametrize('k', [1, 2, 3])
+def test_chunks_match_the_solution(disks: int, k: int):
+    assert b''.join(chunks(disks, 3, 2, k)) == packed(disks, 3, 2)
+
+
+def test_write_binary_matches_write_moves():
+    expected, actual = io.BytesIO(), io.BytesIO()
+    write_moves(expected, hanoi(17, 2, 1), 'binary', n=17, start=2, target=1)
+    assert write_binary(actual, 17, 2, 1) == 2**17 - 1
+    assert actual.getvalue() == expected.getvalue()
+
+
+def test_verify_finds_the_first_wrong_move():
+    out = io.BytesIO()
+    write_binary(out, 16, 1, 2)
+    data = out.getvalue()
+    assert verify(io.BytesIO(data)) is None
+
+    wrong = bytearray(data)
+    wrong[HEADER.size + 2 * 40000] ^= 0b11
+    assert verify(io.BytesIO(bytes(wrong))) == 40001
+    assert verify(io.BytesIO(data[:-2])) == 2**16 - 1
+    assert verify(io.BytesIO(data + b'\0\0')) == 2**16
+
+    with pytest.raises(ValueError, match='not a binary move file'):
+        verify(io.BytesIO(b'move,disk,from,to\n'))
+
+
+def test_verify_command(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    good, bad = tmp_path / 'good.hnb', tmp_path / 'bad.hnb'
+    with open(good, 'wb') as out:
+        write_binary(out, 5)
+    bad.write_bytes(good.read_bytes()[:-2])
+
+    main(['verify', str(good)])
+    assert 'good.hnb: ok' in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(['verify', str(good), str(bad)])
+    assert exit_info.value.code == 1
+    assert 'bad.hnb: move 31' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('variant', ['cyclic', 'adjacent', 'bicolor'])
+def test_verify_checks_the_recorded_variant(variant: str):
+    moves = list(get_solver(variant).moves(5, 1, 3))
+    out = io.BytesIO()
+    write_moves(out, moves, 'binary', n=5, variant=variant)
+    assert verify(io.BytesIO(out.getvalue())) is None
+
+    out = io.BytesIO()
+    write_moves(out, [*moves[:-1], (1, 1, 2)], 'binary', n=5, variant=variant)
+    assert verify(io.BytesIO(out.getvalue())) == len(moves)
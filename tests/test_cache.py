@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from hanoi.batch import Job, run_batch
+from hanoi.blocks import verify, write_binary
+from hanoi.cache import CachedSolution, SolutionCache, cache_key
+from hanoi.cli import main
+from hanoi.formats import HEADER
+from hanoi.solver import get_solver, hanoi
+
+
+def test_keys_are_stable_and_distinct():
+    assert cache_key('classic', 20, 1, 3) == cache_key('classic', 20, 1, 3)
+    keys = {
+        cache_key(variant, n, 1, target) for variant in ('classic', 'cyclic') for n in (20, 21) for target in (2, 3)
+    }
+    assert len(keys) == 8
+
+
+@pytest.mark.parametrize(('variant', 'start', 'target'), [('classic', 2, 1), ('cyclic', 1, 3)])
+def test_cached_moves_match_the_solver(tmp_path: Path, variant: str, start: int, target: int):
+    cache = SolutionCache(tmp_path)
+    assert cache.get(variant, 11, start, target) is None
+    cache.put(variant, 11, start, target)
+    expected = list(get_solver(variant).moves(11, start, target))
+    with cache.get(variant, 11, start, target) as solution:
+        assert len(solution) == len(expected)
+        assert list(solution.moves()) == expected
+        assert solution.move(1000) == expected[1000]
+        assert list(solution.moves(1000)) == expected[1000:]
+
+
+def test_cached_file_is_the_binary_format(tmp_path: Path):
+    path = SolutionCache(tmp_path).put('classic', 17, 1, 2)
+    out = io.BytesIO()
+    write_binary(out, 17, 1, 2)
+    assert path.read_bytes() == out.getvalue()
+
+
+def test_damaged_files_are_generated_again(tmp_path: Path):
+    cache = SolutionCache(tmp_path)
+    path = cache.put('classic', 17)
+    path.write_bytes(path.read_bytes()[:-2])
+    assert cache.get('classic', 17) is None
+    with cache.open('classic', 17) as solution:
+        assert len(solution) == 2**17 - 1
+
+    path.write_bytes(b'not a move file')
+    assert cache.get('classic', 17) is None
+    with pytest.raises(ValueError, match='not a binary move file'):
+        CachedSolution(path)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path: Path):
+    size = HEADER.size + 2 * (2**17 - 1)
+    cache = SolutionCache(tmp_path, max_bytes=2 * size)
+    first, second = cache.put('classic', 17, 1, 2), cache.put('classic', 17, 1, 3)
+    os.utime(first, (1000, 1000))
+    os.utime(second, (2000, 2000))
+    # Reading the older one makes it the most recently used
+    cache.get('classic', 17, 1, 2).close()
+
+    third = cache.put('classic', 17, 2, 3)
+    assert sorted(tmp_path.iterdir()) == sorted([first, third])
+
+
+def test_files_in_use_are_not_evicted(tmp_path: Path):
+    size = HEADER.size + 2 * (2**17 - 1)
+    cache = SolutionCache(tmp_path, max_bytes=size)
+    first, second = cache.put('classic', 17, 1, 2), cache.put('classic', 17, 1, 3)
+    # Both were written by this run, which may still be using them
+    assert sorted(tmp_path.iterdir()) == sorted([first, second])
+
+    os.utime(first, (1000, 1000))
+    os.utime(second, (2000, 2000))
+    third = SolutionCache(tmp_path, max_bytes=size).put('classic', 17, 2, 3)
+    assert list(tmp_path.iterdir()) == [third]
+
+
+def test_a_solution_evicted_by_another_process_is_still_served(tmp_path: Path, monkeypatch: MonkeyPatch):
+    replace = os.replace
+
+    def replace_then_evict(src, dst):
+        replace(src, dst)
+        os.unlink(dst)
+
+    monkeypatch.setattr('hanoi.cache.os.replace', replace_then_evict)
+    with SolutionCache(tmp_path).open('classic', 17, 2, 3) as solution:
+        assert list(solution.moves()) == list(hanoi(17, 2, 3))
+    assert not any(tmp_path.iterdir())
+
+
+def test_read_never_generates(tmp_path: Path):
+    cache = SolutionCache(tmp_path)
+    assert cache.read('classic', 17) is None
+    assert not any(tmp_path.iterdir())
+
+    cache.put('classic', 17)
+    assert list(cache.read('classic', 17, first=1000)) == list(hanoi(17))[1000:]
+
+
+def test_short_or_oversized_solutions_are_not_cached(tmp_path: Path):
+    cache = SolutionCache(tmp_path, max_bytes=1 << 20)
+    assert not cache.cacheable('classic', 10)
+    assert not cache.cacheable('classic', 20)
+    assert cache.cacheable('classic', 17)
+
+    assert list(cache.moves('classic', 10, first=1000)) == list(hanoi(10))[1000:]
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+
+def test_batch_reads_from_the_cache(tmp_path: Path):
+    cache = SolutionCache(tmp_path / 'cache')
+    jobs = [
+        Job(n=17, target=2, format=fmt, output=str(tmp_path / f'{i}.{fmt}'))
+        for i, fmt in enumerate(['binary', 'csv', 'binary'])
+    ]
+    results = run_batch([*jobs, Job(n=17, target=2)], workers=1, cache=cache)
+    assert [result.moves for result in results] == [2**17 - 1] * 4
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+    out = io.BytesIO()
+    write_binary(out, 17, 1, 2)
+    assert Path(jobs[0].output).read_bytes() == Path(jobs[2].output).read_bytes() == out.getvalue()
+    lines = Path(jobs[1].output).read_text().splitlines()
+    assert lines[1] == '1,1,1,2'
+    assert len(lines) == 2**17
+
+
+def test_verify_compares_with_the_cache(tmp_path: Path):
+    cache = SolutionCache(tmp_path)
+    out = io.BytesIO()
+    write_binary(out, 17, 3, 1)
+    wrong = bytearray(out.getvalue())
+    wrong[HEADER.size + 2 * 70000] ^= 0b11
+    assert verify(io.BytesIO(out.getvalue()), cache) is None
+    assert verify(io.BytesIO(bytes(wrong)), cache) == 70001
+    assert cache.path('classic', 17, 3, 1).exists()
+
+
+def test_headless_runs_fill_and_read_the_cache(tmp_path: Path, monkeypatch: MonkeyPatch, capsys):
+    monkeypatch.setattr('hanoi.cache.CACHE_MIN_MOVES', 1)
+    main(['4', '--no-animate', '--cache-dir', str(tmp_path)])
+    solved = capsys.readouterr().out
+    (path,) = tmp_path.iterdir()
+    assert path.name == f'{cache_key("classic", 4, 1, 3)}.hnb'
+
+    main(['4', '--no-animate', '--cache-dir', str(tmp_path)])
+    assert capsys.readouterr().out == solved
+
+    main(['--resume', '3311', '--no-animate', '--cache-dir', str(tmp_path)])
+    assert capsys.readouterr().out.splitlines() == solved.splitlines()[3:]
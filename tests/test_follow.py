@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import io
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from hanoi.cli import main
+from hanoi.follow import MoveFeed
+from hanoi.formats import FORMATS, read_moves, write_moves
+from hanoi.solver import get_solver, hanoi
+from hanoi.state import IllegalMove
+
+
+def encode(moves, fmt: str, n: int, start: int = 1, target: int = 3) -> io.BytesIO:
+    out = io.BytesIO()
+    write_moves(out, moves, fmt, n=n, start=start, target=target)
+    out.seek(0)
+    return out
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_read_moves_round_trips_every_format(fmt: str):
+    header, moves = read_moves(encode(hanoi(6, 2, 1), fmt, 6, 2, 1))
+    assert header.format == fmt
+    assert list(moves) == list(hanoi(6, 2, 1))
+    if fmt == 'binary':
+        assert (header.n, header.start, header.target) == (6, 2, 1)
+
+
+def test_read_moves_rejects_garbage():
+    _, moves = read_moves(io.BytesIO(b' 1: Move disk 1 from peg 1 to 3.\nnot a move\n'))
+    with pytest.raises(ValueError, match='line 2: not a move'):
+        list(moves)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_feed_checks_moves_and_finds_the_start(fmt: str):
+    feed = MoveFeed(encode(get_solver('cyclic').moves(3, 3, 2), fmt, 3, 3, 2), n=3)
+    assert (feed.n, feed.start) == (3, 3)
+    assert list(feed) == list(get_solver('cyclic').moves(3, 3, 2))
+    assert feed.solved
+    assert feed.error is None
+
+
+def test_feed_stops_at_an_illegal_move():
+    moves = [(1, 1, 3), (2, 1, 2), (1, 3, 2), (3, 1, 2)]
+    feed = MoveFeed(encode(moves, 'csv', 3), n=3)
+    with pytest.raises(IllegalMove, match='move 4: cannot place disk 3 on disk 1'):
+        list(feed)
+    assert not feed.solved
+
+
+@pytest.mark.parametrize(
+    ('stream', 'message'),
+    [
+        (b'move,disk,from,to\n1,1,0,3\n', 'must start on one of pegs'),
+        (b'HNOI\x02\x03\x01\x01\x00\x00', 'start and target pegs must differ'),
+    ],
+)
+def test_feed_rejects_a_bad_start_up_front(stream: bytes, message: str):
+    with pytest.raises(ValueError, match=message):
+        MoveFeed(io.BytesIO(stream), n=3)
+
+
+def test_text_streams_need_the_number_of_disks():
+    with pytest.raises(ValueError, match='do not record the number of disks'):
+        MoveFeed(encode(hanoi(3), 'text', 3))
+
+
+def test_feed_does_not_block_on_a_quiet_pipe():
+    read_end, write_end = os.pipe()
+    with os.fdopen(read_end, 'rb') as stream, os.fdopen(write_end, 'wb', buffering=0) as writer:
+        moves = list(hanoi(3))
+        writer.write(encode(moves[:1], 'csv', 3).read())
+        feed = MoveFeed(stream, n=3, maxsize=2)
+
+        # Nothing more has been written, get returns straight away
+        started = time.perf_counter()
+        assert feed.get() == moves[0]
+        assert feed.get() is None
+        assert time.perf_counter() - started < 0.5
+        assert not feed.done
+
+        writer.write(b''.join(f'{i},{d},{f},{t}\n'.encode() for i, (d, f, t) in enumerate(moves[1:], 2)))
+        writer.close()
+        assert list(feed) == moves[1:]
+        assert feed.done and feed.solved
+
+
+def test_queue_is_bounded():
+    feed = MoveFeed(encode(hanoi(10), 'binary', 10), maxsize=8)
+    deadline = time.perf_counter() + 2
+    while feed.depth < 8 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert feed.depth == 8
+    assert feed.get() == (1, 1, 2)
+    feed.close()
+
+
+def test_following_takes_the_variant_from_the_stream(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    stream = tmp_path / 'cyclic.hnb'
+    moves = list(get_solver('cyclic').moves(5, 1, 3))
+    with open(stream, 'wb') as out:
+        write_moves(out, moves, 'binary', n=5, variant='cyclic')
+
+    main(['--no-animate', '--follow', str(stream)])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(moves) > 100
+    # Numbered to the length of the cyclic solution, not the classic one
+    assert lines[0] == f'  1: Move disk 1 from peg 1 to {moves[0][2]}.'
+
+    with pytest.raises(ValueError, match='the stream solves the cyclic variant, not adjacent'):
+        main(['--no-animate', '--variant', 'adjacent', '--follow', str(stream)])
@@ -2,12 +2,36 @@ from __future__ import annotations
 
 import sys
 
+import pytest
 from _pytest.monkeypatch import MonkeyPatch
 
 from hanoi.cli import main
 
 
 def test_no_animate_does_not_import_pygame(monkeypatch: MonkeyPatch):
+    # Other tests may have imported pygame already in this process
+    for name in [name for name in sys.modules if name == 'pygame' or name.startswith('pygame.')]:
+        monkeypatch.delitem(sys.modules, name)
     monkeypatch.setattr(sys, 'argv', ['hanoi-viz', '--no-animate', '3'])
     main()
     assert 'pygame' not in sys.modules
+
+
+def test_resume_continues_from_the_saved_board(capsys):
+    main(['--no-animate', '--resume', '3311'])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == ' 4: Move disk 3 from peg 1 to 2.'
+    assert len(lines) == 12
+
+
+@pytest.mark.parametrize(
+    ('argv', 'message'),
+    [
+        (['--no-animate', '--resume', '1' * 16], 'has 16 disks, the disks view shows at most 15'),
+        (['--no-animate', '--play', '--resume', '2222'], '--play needs a window'),
+    ],
+)
+def test_resume_rejects_boards_it_cannot_run(argv: list[str], message: str, capsys):
+    with pytest.raises(SystemExit):
+        main(argv)
+    assert message in capsys.readouterr().err
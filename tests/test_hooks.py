@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from hanoi.cli import main
+from hanoi.hooks import Hooks, Observer, PrometheusTextfileSink, observe
+from hanoi.solver import hanoi
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.moves = []
+        self.finished = None
+
+    def on_move(self, i: int, disk: int, from_: int, to: int) -> None:
+        self.moves.append((i, disk, from_, to))
+
+    def on_finish(self, moves: int) -> None:
+        self.finished = moves
+
+
+def test_observe_reports_every_move_and_the_finish():
+    recorder = Recorder()
+    moves = list(observe(hanoi(4), Hooks(recorder)))
+
+    assert recorder.moves == [(i, *move) for i, move in enumerate(moves, 1)]
+    assert recorder.finished == 15
+
+
+def test_observe_without_hooks_returns_the_stream_itself():
+    moves = hanoi(4)
+    assert observe(moves, Hooks()) is moves
+    assert observe(moves, None) is moves
+
+
+def test_only_overridden_callbacks_are_registered():
+    hooks = Hooks(Recorder())
+    assert len(hooks._callbacks['on_move']) == 1
+    assert hooks._callbacks['on_frame'] == []
+
+
+def test_prometheus_textfile(tmp_path: Path):
+    path = tmp_path / 'hanoi.prom'
+    sink = PrometheusTextfileSink(path)
+    hooks = Hooks(sink)
+    hooks.on_pause(True)
+    hooks.on_pause(False)
+    hooks.on_frame(0.016)
+    list(observe(hanoi(5), hooks))
+
+    metrics = dict(line.split() for line in path.read_text().splitlines() if not line.startswith('#'))
+    assert metrics['hanoi_moves_total'] == '31'
+    assert metrics['hanoi_frames_total'] == '1'
+    assert metrics['hanoi_finished'] == '1'
+    assert float(metrics['hanoi_paused_seconds_total']) >= 0
+    assert '# TYPE hanoi_moves_per_second gauge' in path.read_text()
+
+
+def test_headless_metrics_jsonl(tmp_path: Path):
+    path = tmp_path / 'metrics.jsonl'
+    main(['--no-animate', '6', '--metrics', str(path)])
+
+    snapshots = [json.loads(line) for line in path.read_text().splitlines()]
+    assert snapshots[-1]['moves_total'] == 63
+    assert snapshots[-1]['finished'] == 1
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+
+import pytest
+from rich.console import Console
+
+from hanoi.log import BackgroundLog
+
+
+class GatedFile(io.StringIO):
+    """A terminal that hangs until the gate opens."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.gate.wait()
+        return super().write(text)
+
+
+def console(file: io.StringIO) -> Console:
+    return Console(file=file, width=200, color_system=None)
+
+
+def test_prints_everything_in_order():
+    out = io.StringIO()
+    log = BackgroundLog(console(out))
+    for i in range(100):
+        log.print(f'line {i}')
+    log.close()
+    assert out.getvalue().splitlines() == [f'line {i}' for i in range(100)]
+
+
+@pytest.mark.parametrize('policy', ['coalesce', 'drop'])
+def test_a_stalled_console_never_blocks(policy: str):
+    out = GatedFile()
+    log = BackgroundLog(console(out), policy, maxsize=4)
+
+    started = time.perf_counter()
+    for i in range(50):
+        log.print(f'line {i}')
+    assert time.perf_counter() - started < 0.5
+
+    out.gate.set()
+    log.close()
+    lines = out.getvalue().splitlines()
+    printed = [int(line.split()[1]) for line in lines if line.startswith('line')]
+    assert printed == sorted(printed)
+    assert printed[0] == 0
+    skipped = int(next(line for line in lines if line.startswith('...')).split()[1])
+    assert skipped + len(printed) == 50
+    assert log.dropped == skipped
+    if policy == 'coalesce':
+        # The latest line survives, after a note of what was skipped
+        assert lines[-2:] == [f'... {skipped} lines skipped', 'line 49']
+    else:
+        assert lines[-1] == f'... {skipped} lines dropped'
+
+
+def test_quiet_prints_nothing():
+    out = io.StringIO()
+    log = BackgroundLog(console(out), quiet=True)
+    log.print('line 0')
+    log.close()
+    assert out.getvalue() == ''
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match='unknown log policy'):
+        BackgroundLog(console(io.StringIO()), 'block')
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from hanoi.cli import Settings
+from hanoi.follow import MoveFeed
+from hanoi.formats import write_moves
+from hanoi.game import Game
+from hanoi.game.constants import HEIGHT, WIDTH
+from hanoi.game.events import ReplaySource
+from hanoi.game.exceptions import QuitGame
+from hanoi.solver import hanoi
+
+
+@pytest.fixture(autouse=True)
+def screen(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+
+def play(tmp_path: Path, n: int, keys: list[str]) -> Game:
+    """Play a game by pressing ``keys`` 30 frames apart, then quit."""
+    settings = Settings(n_disks=n, speed=100, animate=True, play=True)
+    lines = [{'version': 1, 'settings': asdict(settings)}]
+    for i, char in enumerate([*keys, 'q']):
+        lines.append({'frame': 30 * (i + 1), 'poll': 0, 'type': 'KeyDown', 'key': ord(char), 'mod': 0, 'unicode': char})
+    recording = tmp_path / 'play.jsonl'
+    recording.write_text(''.join(json.dumps(line) + '\n' for line in lines))
+
+    events = ReplaySource(str(recording))
+    game = Game(events.settings, events)
+    with pytest.raises(QuitGame):
+        game.run()
+    return game
+
+
+def test_solving_by_hand(tmp_path: Path):
+    game = play(tmp_path, 2, ['1', '2', '1', '3', '2', '3'])
+    assert game.finished
+    assert game.player_moves == 3
+    assert game.distance == 0
+    assert [len(game.sim.stacks[peg]) for peg in (1, 2, 3)] == [0, 0, 2]
+
+
+def test_illegal_moves_are_rejected_and_hints_shown(tmp_path: Path):
+    game = play(tmp_path, 3, ['1', '3', '1', '3', 'h'])
+    assert game.player_moves == 1
+    assert game.distance == 6
+    assert game.current_move_text == 'Hint: move disk 2 from peg 1 to 2.'
+
+
+def test_empty_peg_cannot_be_picked(tmp_path: Path):
+    game = play(tmp_path, 3, ['2'])
+    assert game.selected_peg is None
+    assert game.current_move_text == 'Peg 2 is empty.'
+
+
+def test_a_game_closes_the_log_it_started(tmp_path: Path):
+    threads = threading.active_count()
+    game = play(tmp_path, 3, ['1', '3'])
+    assert game.owns_log
+    assert threading.active_count() == threads
+
+
+def test_a_cold_cache_does_not_hold_up_the_first_move(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('hanoi.cache.CACHE_MIN_MOVES', 1)
+    cache_dir = tmp_path / 'cache'
+    settings = Settings(n_disks=10, speed=100, animate=True, cache_dir=str(cache_dir), quiet=True)
+    game = Game(settings)
+    assert next(game.sim.moves) == (1, (1, 1, 2))
+    # The solver is used as usual, the cache is not filled from the render loop
+    assert not cache_dir.exists()
+
+
+def test_following_a_stream(tmp_path: Path):
+    stream = tmp_path / 'moves.hnb'
+    with open(stream, 'wb') as out:
+        write_moves(out, hanoi(4, 2, 3), 'binary', n=4, start=2, target=3)
+
+    settings = Settings(n_disks=4, speed=100, animate=True, view='disks')
+    recording = tmp_path / 'follow.jsonl'
+    recording.write_text(json.dumps({'version': 1, 'settings': asdict(settings)}) + '\n' + json.dumps({'end': 2000}))
+
+    feed = MoveFeed(open(stream, 'rb'), close_stream=True)  # noqa: SIM115
+    game = Game(settings, ReplaySource(str(recording)), feed=feed)
+    assert len(game.sim.stacks[2]) == 4
+    with pytest.raises(QuitGame):
+        game.run()
+    assert game.finished
+    assert game.sim.moves_made == 15
+    assert game.current_move_text == '4 disks solved in 15 moves.'
+    assert [len(game.sim.stacks[peg]) for peg in (1, 2, 3)] == [0, 0, 4]
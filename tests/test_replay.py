@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from hanoi.cli import Settings
+from hanoi.game import Game, StartScreen
+from hanoi.game.constants import HEIGHT, WIDTH
+from hanoi.game.events import EventSource, ReplaySource
+from hanoi.game.exceptions import QuitGame
+
+
+@pytest.fixture
+def screen(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+
+def write_recording(path: Path, settings: Settings, events: list[dict], end: int) -> None:
+    lines = [{'version': 1, 'settings': asdict(settings)}, *events, {'end': end}]
+    path.write_text(''.join(json.dumps(line) + '\n' for line in lines))
+
+
+def key(frame: int, key: int, unicode: str = '') -> dict:
+    return {'frame': frame, 'poll': 0, 'type': 'KeyDown', 'key': key, 'mod': 0, 'unicode': unicode, 'scancode': 0}
+
+
+def play(path: Path, screen: pygame.Surface) -> tuple[ReplaySource, Game]:
+    events = ReplaySource(str(path))
+    settings = StartScreen(screen, events.settings, events).run()
+    game = Game(settings, events)
+    with pytest.raises(QuitGame):
+        game.run()
+    return events, game
+
+
+def test_replay_is_frame_exact(tmp_path: Path, screen: pygame.Surface):
+    recording = tmp_path / 'session.jsonl'
+    settings = Settings(n_disks=3, speed=40, animate=True)
+    # Start the game from the start button, let it finish, then quit with q
+    events = [key(1, pygame.K_DOWN), key(2, pygame.K_DOWN), key(3, pygame.K_RETURN), key(600, pygame.K_q, 'q')]
+    write_recording(recording, settings, events, end=600)
+
+    first_events, first_game = play(recording, screen)
+    second_events, second_game = play(recording, screen)
+
+    assert first_events.frame == second_events.frame == 600
+    assert first_game.finished and second_game.finished
+    assert first_game.current_move_text == second_game.current_move_text == '3 disks solved in 7 moves.'
+    assert first_events.frame_time_stats()['frames'] == 600
+
+
+def test_replay_ends_when_the_recording_runs_out(tmp_path: Path, screen: pygame.Surface):
+    recording = tmp_path / 'session.jsonl'
+    write_recording(recording, Settings(n_disks=3, speed=15, animate=True), [key(1, pygame.K_SPACE)], end=50)
+
+    events = ReplaySource(str(recording))
+    with pytest.raises(QuitGame):
+        StartScreen(screen, events.settings, events).run()
+    assert events.frame == 51
+
+
+class ScriptedSource(EventSource):
+    """A live, recording source with key presses posted on the given frames and an unthrottled clock."""
+
+    def __init__(self, path: Path, settings: Settings, script: dict[int, list[pygame.event.Event]]):
+        super().__init__(str(path), settings)
+        self.script = script
+        self.clock = SimpleNamespace(tick=lambda fps: 1000 // fps)
+
+    def get(self) -> list[pygame.event.Event]:
+        if self.poll == 0:
+            for event in self.script.pop(self.frame, ()):
+                pygame.event.post(event)
+        return super().get()
+
+
+def test_a_recorded_session_replays_the_same(tmp_path: Path, screen: pygame.Surface):
+    recording = tmp_path / 'session.jsonl'
+    settings = Settings(n_disks=4, speed=40, animate=True, quiet=True)
+
+    def press(key: int, unicode: str = '') -> list[pygame.event.Event]:
+        return [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=unicode, scancode=0)]
+
+    # Start the game, pause it for a while once the solver has started, then quit half way through
+    script = {
+        1: press(pygame.K_DOWN),
+        2: press(pygame.K_DOWN),
+        3: press(pygame.K_RETURN),
+        160: press(pygame.K_SPACE, ' '),
+        190: press(pygame.K_SPACE, ' '),
+        260: press(pygame.K_q, 'q'),
+    }
+    expected = [(frame, events[0].key) for frame, events in sorted(script.items())]
+    live = ScriptedSource(recording, settings, script)
+    live_game = Game(StartScreen(screen, settings, live).run(), live)
+    with pytest.raises(QuitGame):
+        live_game.run()
+    live.close()
+
+    lines = [json.loads(line) for line in recording.read_text().splitlines()]
+    assert lines[0]['settings'] == asdict(settings)
+    assert lines[-1] == {'end': live.frame}
+    assert [(line['frame'], line['key']) for line in lines[1:-1]] == expected
+
+    replay, replay_game = play(recording, screen)
+    assert replay.frame == live.frame
+    assert 0 < replay_game.sim.moves_made == live_game.sim.moves_made < 15
+    assert replay_game.sim.stacks == live_game.sim.stacks
+    assert replay_game.sim.positions == live_game.sim.positions
+    assert not replay_game.finished
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import deque
+
+import pytest
+
+from hanoi.simulation import Layout, Simulation
+from hanoi.solver import hanoi
+
+LAYOUT = Layout(peg_x=(200, 400, 600), base_y=360, lift_y=138, disk_height=10)
+
+
+def simulation(n: int, **kwargs) -> Simulation:
+    kwargs.setdefault('speed', 900.0)
+    return Simulation(LAYOUT, {1: list(range(n))}, enumerate(hanoi(n), 1), total_moves=2**n - 1, **kwargs)
+
+
+def run(sim: Simulation, dt: float, max_ticks: int = 1_000_000) -> int:
+    """Tick until the run finishes. Returns the number of ticks."""
+    for ticks in range(1, max_ticks + 1):
+        sim.tick(dt)
+        if sim.finished:
+            return ticks
+    raise AssertionError('the simulation did not finish')
+
+
+def test_runs_to_the_end_without_a_display():
+    sim = simulation(6)
+    landed = []
+    for _ in range(100_000):
+        sim.tick(1 / 60)
+        landed += sim.landed
+        if sim.finished:
+            break
+    assert landed == list(enumerate(hanoi(6), 1))
+    assert sim.stacks == {1: [], 2: [], 3: list(range(6))}
+    assert sim.progress == 1.0
+    assert [sim.positions[i] for i in range(6)] == [[600, 360 - 10 * level] for level in range(6)]
+
+
+def test_time_not_ticks_sets_the_pace():
+    coarse = run(simulation(4), 1 / 30)
+    fine = run(simulation(4), 1 / 240)
+    assert coarse / 30 == pytest.approx(fine / 240, rel=0.05)
+
+
+def test_disks_move_in_three_phases():
+    sim = simulation(3, speed=60.0)
+    sim.tick(1.0)
+    ((i, move),) = sim.started
+    assert (i, move) == (1, (1, 1, 3))
+    # The top disk is 60 pixels on its way up to the carrying height
+    assert sim.positions[2] == [200, 340 - 60]
+    assert sim.flight.phase == 0
+    assert sim.progress == 0
+    # The remaining 142 pixels up, 400 across and 222 down, and a little into the next move
+    sim.tick(13.0)
+    assert sim.landed == [(1, (1, 1, 3))]
+    assert sim.started == [(2, (2, 1, 2))]
+    assert sim.positions[2] == [600, 360]
+
+
+def test_pause_and_step():
+    sim = simulation(3, delay=2.0)
+    sim.tick(1.0)
+    assert not sim.started
+    sim.paused = True
+    sim.tick(100.0)
+    assert sim.moves_made == 0
+
+    sim.step_once = True
+    for _ in range(1000):
+        sim.tick(1 / 60)
+    assert sim.moves_made == 1
+    assert sim.paused and not sim.step_once
+
+
+def test_instant_mode_lands_a_batch_per_tick():
+    sim = simulation(10, instant=True, moves_per_tick=100)
+    sim.tick(0.0)
+    assert len(sim.landed) == 100
+    assert sim.moves_made == 100
+    assert run(sim, 0.0) == 10
+
+
+def test_waits_for_a_source_with_nothing_ready():
+    queue = deque()
+
+    def drain():
+        while True:
+            yield queue.popleft() if queue else None
+
+    sim = Simulation(LAYOUT, {1: [0, 1]}, drain(), total_moves=3, speed=10_000.0)
+    sim.tick(1.0)
+    assert not sim.started and not sim.finished
+    queue.append((1, (1, 1, 2)))
+    sim.tick(1.0)
+    assert sim.landed == [(1, (1, 1, 2))]
+    assert sim.stacks == {1: [0], 2: [1], 3: []}
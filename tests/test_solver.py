@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from hanoi.solver import hanoi
+import pytest
+
+from hanoi.solver import SOLVERS, benchmark, get_solver, hanoi, hanoi_from
 
 
 def test_move_count():
@@ -28,3 +30,66 @@ def test_moves_are_legal_and_solve():
     assert pegs[1] == []
     assert pegs[2] == []
     assert pegs[3] == list(range(n, 0, -1))
+
+
+RULES = {
+    'classic': lambda from_, to: True,
+    'cyclic': lambda from_, to: to == from_ % 3 + 1,
+    'adjacent': lambda from_, to: {from_, to} != {1, 3},
+    'bicolor': lambda from_, to: True,
+}
+
+
+@pytest.mark.parametrize('name', list(SOLVERS))
+@pytest.mark.parametrize(('start', 'target'), [(1, 3), (1, 2), (2, 1), (3, 2), (2, 3), (3, 1)])
+def test_registered_solvers_are_legal_and_match_their_count(name: str, start: int, target: int):
+    assert set(RULES) == set(SOLVERS)
+    solver = get_solver(name)
+    n = 5
+    tower = list(enumerate(solver.tower(n)))  # (identity, size) so colors are tracked too
+    pegs: dict[int, list[tuple[int, int]]] = {1: [], 2: [], 3: []}
+    pegs[start] = list(tower)
+
+    count = 0
+    for size, from_, to in solver.moves(n, start, target):
+        count += 1
+        assert RULES[name](from_, to)
+        disk = pegs[from_].pop()
+        assert disk[1] == size
+        if pegs[to]:
+            assert pegs[to][-1][1] >= size
+        pegs[to].append(disk)
+
+    assert pegs[target] == tower
+    assert count == solver.count(n, start, target)
+
+
+def test_closed_form_counts():
+    assert [get_solver('cyclic').count(n, 1, 2) for n in range(1, 6)] == [1, 5, 15, 43, 119]
+    assert [get_solver('cyclic').count(n, 1, 3) for n in range(1, 6)] == [2, 7, 21, 59, 163]
+    assert get_solver('adjacent').count(4, 1, 3) == 80
+    assert get_solver('adjacent').count(4, 2, 3) == 40
+    assert get_solver('bicolor').count(3, 1, 3) == 27
+
+
+def test_classic_is_hanoi():
+    assert list(get_solver('classic').moves(8, 2, 1)) == list(hanoi(8, 2, 1))
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError, match='unknown variant'):
+        get_solver('magnetic')
+
+
+def test_benchmark_covers_every_solver():
+    results = benchmark(4)
+    assert [result.solver for result in results] == list(SOLVERS)
+    assert all(result.moves == get_solver(result.solver).count(4, 1, 3) for result in results)
+
+
+def test_hanoi_from_skips_ahead():
+    moves = list(hanoi(7, 3, 2))
+    for index in (0, 1, 64, 127):
+        assert list(hanoi_from(7, index, 3, 2)) == moves[index:]
+    with pytest.raises(ValueError):
+        list(hanoi_from(7, 128))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections import deque
+from itertools import product
+
+import pytest
+
+from hanoi.solver import hanoi
+from hanoi.state import Board, IllegalMove, locate, parse_pegs
+
+
+def bfs_distances(n: int, target: int) -> dict[tuple[int, ...], int]:
+    """Distance to the solved position for every configuration, by brute force."""
+    goal = (target,) * n
+    distances = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        pegs = queue.popleft()
+        board = Board.from_pegs(pegs)
+        for from_, to in product((1, 2, 3), repeat=2):
+            if board.is_legal(from_, to):
+                after = Board.from_pegs(pegs)
+                after.move(from_, to)
+                key = tuple(after.pegs())
+                if key not in distances:
+                    distances[key] = distances[pegs] + 1
+                    queue.append(key)
+    return distances
+
+
+@pytest.mark.parametrize('target', [1, 2, 3])
+def test_distance_and_hint_are_optimal_from_every_position(target: int):
+    n = 5
+    for pegs, expected in bfs_distances(n, target).items():
+        board = Board.from_pegs(pegs)
+        assert board.distance(target) == expected
+        if expected:
+            disk, from_, to = board.next_move(target)
+            assert board.move(from_, to) == disk
+            assert board.distance(target) == expected - 1
+        else:
+            assert board.next_move(target) is None
+
+
+def test_hints_follow_the_solver():
+    board = Board.initial(7)
+    for move in hanoi(7):
+        assert board.next_move() == move
+        board.move(*move[1:])
+    assert board.is_solved()
+
+
+def test_illegal_moves():
+    board = Board.initial(3)
+    board.move(1, 2)
+    assert board.top(1) == 2
+    assert not board.is_legal(1, 2)
+    with pytest.raises(IllegalMove, match='cannot place disk 2 on disk 1'):
+        board.move(1, 2)
+    with pytest.raises(IllegalMove, match='peg 3 is empty'):
+        board.move(3, 1)
+
+
+def test_from_stacks_validates():
+    assert Board.from_stacks(3, {1: [3], 2: [2, 1]}) == Board.from_pegs([2, 2, 1])
+    with pytest.raises(ValueError):
+        Board.from_stacks(3, {1: [1, 3], 2: [2]})
+    with pytest.raises(ValueError):
+        Board.from_stacks(3, {1: [3, 2], 2: [2, 1]})
+
+
+@pytest.mark.parametrize(('start', 'target'), [(1, 3), (2, 1)])
+def test_locate_matches_a_brute_force_search(start: int, target: int):
+    n = 5
+    path = [tuple([start] * n)]
+    board = Board.initial(n, start)
+    for _, from_, to in hanoi(n, start, target):
+        board.move(from_, to)
+        path.append(tuple(board.pegs()))
+
+    # Multi-source search out from every position on the path
+    distances = dict.fromkeys(path, 0)
+    queue = deque(path)
+    while queue:
+        pegs = queue.popleft()
+        for from_, to in product((1, 2, 3), repeat=2):
+            after = Board.from_pegs(pegs)
+            if after.is_legal(from_, to):
+                after.move(from_, to)
+                key = tuple(after.pegs())
+                if key not in distances:
+                    distances[key] = distances[pegs] + 1
+                    queue.append(key)
+
+    assert len(distances) == 3**n
+    for pegs, distance in distances.items():
+        position = locate(pegs, start, target)
+        assert position.distance == distance
+        assert position.index == (path.index(pegs) if distance == 0 else None)
+
+
+def test_parse_pegs():
+    assert parse_pegs('3312') == [3, 3, 1, 2]
+    with pytest.raises(ValueError):
+        parse_pegs('3412')
+    with pytest.raises(ValueError):
+        parse_pegs('')